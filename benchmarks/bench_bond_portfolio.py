@@ -0,0 +1,33 @@
+"""
+Portfolio pricing against one ZeroRateCurve: BondPortfolio vs. a per bond loop.
+
+Run from the repository root:
+    python -m benchmarks.bench_bond_portfolio [n_bonds ...]
+"""
+import sys
+import numpy as np
+
+from src.python.interest_rate import ZeroRateCurve
+from src.python.bond_portfolio import BondPortfolio
+from benchmarks.data import make_zero_rates, make_bonds
+from benchmarks.harness import timeit
+
+def run(n_bonds):
+    zero_rates = make_zero_rates()
+    curve = ZeroRateCurve(zero_rates)
+    bonds = make_bonds(n_bonds)
+
+    t_loop_raw, _ = timeit(lambda: [bond.get_bond_price_from_zero_rates(zero_rates=zero_rates) for bond in bonds], repeat=1)
+    t_loop, loop_prices = timeit(lambda: np.array([bond.get_bond_price_from_zero_rates(zero_rates=curve) for bond in bonds]))
+    t_build, portfolio = timeit(lambda: BondPortfolio(bonds))
+    t_price, portfolio_prices = timeit(lambda: portfolio.get_bond_prices_from_zero_rates(zero_rates=curve))
+
+    assert np.allclose(loop_prices, portfolio_prices, rtol=1e-12)
+    print(f"n_bonds={n_bonds:>7d} | loop (curve rebuilt per bond) {t_loop_raw:8.4f}s "
+          f"| loop (shared curve) {t_loop:8.4f}s | portfolio build {t_build:8.4f}s "
+          f"| portfolio price {t_price:8.4f}s | speedup vs shared loop {t_loop/t_price:8.1f}x")
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [100, 1_000, 10_000]
+    for n_bonds in sizes:
+        run(n_bonds)
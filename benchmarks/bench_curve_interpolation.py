@@ -0,0 +1,36 @@
+"""
+Curve evaluation: the curve kernels of src.python.curve_interpolation vs. scipy's interp1d,
+called once per time (the old InterestRateCurve.discount_cashflow path) and once per array.
+
+Run from the repository root:
+    python -m benchmarks.bench_curve_interpolation [n_times ...]
+"""
+import sys
+import numpy as np
+from scipy.interpolate import interp1d
+
+from src.python.curve_interpolation import INTERPOLATORS
+from benchmarks.harness import timeit
+
+def run(n_times, n_points=40):
+    knot_times = np.linspace(0.25, 30.0, n_points)
+    knot_rates = 0.03 + 0.02*(1.0 - np.exp(-knot_times/5.0))
+    times = np.random.default_rng(0).uniform(0.0, 35.0, n_times)
+
+    t_build, curve = timeit(lambda: interp1d(x=knot_times, y=knot_rates, kind="linear", bounds_error=False, fill_value=(knot_rates[0], knot_rates[-1])))
+    t_points, _ = timeit(lambda: [np.exp(-curve(t)*t) for t in times], repeat=1)
+    t_array, reference = timeit(lambda: np.exp(-curve(times)*times))
+    print(f"n_times={n_times:>8d} | interp1d build {t_build*1e6:8.1f}us | per point {t_points:8.4f}s | per array {t_array*1e3:8.3f}ms")
+
+    for name, interpolator_class in INTERPOLATORS.items():
+        t_build, interpolator = timeit(lambda: interpolator_class(knot_times, knot_rates))
+        t_array, discount_factors = timeit(lambda: interpolator.discount_factors(times))
+        if name == 'linear':
+            assert np.allclose(discount_factors, reference, atol=1e-14)
+        print(f"{'':17s}| {name:20s} build {t_build*1e6:8.1f}us | per array {t_array*1e3:8.3f}ms "
+              f"| speedup vs interp1d per point {t_points/t_array:10.1f}x")
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [100, 10_000, 1_000_000]
+    for n_times in sizes:
+        run(n_times)
@@ -0,0 +1,38 @@
+"""
+Convergence of CrankNicolsonVanillaOption to BlackScholesVanillaCall.option_price for
+European calls, and timing of American puts batched over strikes on a shared grid.
+
+Run from the repository root:
+    python -m benchmarks.bench_finite_difference [grid size ...]
+"""
+import sys
+import numpy as np
+
+from src.python.interest_rate import InterestRate
+from src.python.analytic_solutions.vanilla_call import BlackScholesVanillaCall
+from src.python.numerical_solutions.finite_difference import CrankNicolsonVanillaOption
+from benchmarks.harness import timeit
+
+def run(sizes):
+    r = InterestRate(0.05, 'continuous')
+    q = InterestRate(0.02, 'continuous')
+    K = np.linspace(80., 120., 9)
+    analytic = BlackScholesVanillaCall.price_and_greeks(S=100., K=K, T=1., sigma=0.2, r=r, q=q)
+
+    previous_error = None
+    for n in sizes:
+        elapsed, numerical = timeit(lambda: CrankNicolsonVanillaOption(S=100., K=K, T=1., sigma=0.2, r=r, q=q, american=False, n_space=n, n_time=n).solve(), repeat=1)
+        error = np.abs(numerical['price'] - analytic['price']).max()
+        order = np.log2(previous_error/error) if previous_error else np.nan
+        print(f"european n={n:>5d} | {elapsed:8.3f}s | max price error {error:.3e} | order {order:5.2f} "
+              f"| max delta error {np.abs(numerical['delta'] - analytic['delta']).max():.3e} "
+              f"| max gamma error {np.abs(numerical['gamma'] - analytic['gamma']).max():.3e}")
+        previous_error = error
+
+    for n_strikes in (1, 10, 100):
+        strikes = np.linspace(80., 120., n_strikes)
+        elapsed, _ = timeit(lambda: CrankNicolsonVanillaOption(S=100., K=strikes, T=1., sigma=0.2, r=r, q=q, option_type='put').solve(), repeat=1)
+        print(f"american put, {n_strikes:>4d} strikes on a 200x200 grid | {elapsed:8.3f}s | {elapsed/n_strikes*1e3:8.2f}ms per strike")
+
+if __name__ == "__main__":
+    run([int(n) for n in sys.argv[1:]] or [50, 100, 200, 400])
@@ -0,0 +1,24 @@
+""" Synthetic market data and instruments shared by the benchmarks. """
+import numpy as np
+
+from src.python.interest_rate import InterestRate, ZeroRate
+from src.python.bond import Bond
+
+def make_zero_rates(n_points=40, max_time=30.0):
+    times = np.linspace(max_time/n_points, max_time, n_points)
+    rates = 0.03 + 0.02*(1.0 - np.exp(-times/5.0))
+    return ZeroRate(times, rates, 'continuous')
+
+def make_bonds(n_bonds, seed=0):
+    rng = np.random.default_rng(seed)
+    frequencies = rng.choice([1, 2, 4], size=n_bonds)
+    maturities = rng.integers(1, 61, size=n_bonds)*0.5
+    coupons = rng.uniform(0.01, 0.08, size=n_bonds)
+    return [Bond(principal=100.0, interest_rate=InterestRate(c, 1), coupon_frequency=int(m), time_to_maturity=float(T))
+            for c, m, T in zip(coupons, frequencies, maturities)]
+
+def make_contracts(n_contracts, seed=0):
+    """ Arrays S, K, T, sigma of European calls. """
+    rng = np.random.default_rng(seed)
+    return dict(S=rng.uniform(50., 150., n_contracts), K=rng.uniform(50., 150., n_contracts),
+                T=rng.uniform(0.1, 3.0, n_contracts), sigma=rng.uniform(0.1, 0.6, n_contracts))
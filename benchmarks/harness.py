@@ -0,0 +1,137 @@
+"""
+Benchmark harness: registry of benchmarks with parametrized problem sizes, timing,
+peak memory, JSON history across commits, regression checks and hot spot reports.
+"""
+import cProfile
+import datetime
+import io
+import json
+import os
+import platform
+import pstats
+import subprocess
+import time
+import tracemalloc
+
+BENCHMARKS = {}
+
+class Benchmark:
+    """
+    A benchmark is a `setup(size)` function returning (run, n_items): `run` is the zero
+    argument callable that is timed and n_items is the number of items (bonds, contracts,
+    ...) it processes, used for the throughput.
+    """
+    def __init__(self, name, setup, parameter, sizes):
+        self.name = name
+        self.setup = setup
+        self.parameter = parameter
+        self.sizes = sizes
+
+def benchmark(name, *, parameter, sizes):
+    """
+    Registers `setup` as a benchmark, `parameter` names the problem size (e.g. 'n_bonds')
+    and `sizes` maps a size preset ('small', 'medium', 'large') to its value.
+    """
+    def register(setup):
+        assert name not in BENCHMARKS, f"benchmark {name!r} is registered twice"
+        BENCHMARKS[name] = Benchmark(name, setup, parameter, sizes)
+        return setup
+    return register
+
+def timeit(f, repeat=3):
+    """ Returns the best wall time of `repeat` calls of f and the result of the last call. """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = f()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_benchmark(benchmark, preset, *, repeat=5)->dict:
+    size = benchmark.sizes[preset]
+    run, n_items = benchmark.setup(size)
+
+    run()  # warm up
+    seconds, _ = timeit(run, repeat=repeat)
+
+    tracemalloc.start()
+    run()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return dict(name=benchmark.name, preset=preset, parameter=benchmark.parameter, size=size,
+                seconds=seconds, throughput=n_items/seconds if seconds > 0.0 else float('inf'), peak_memory_bytes=peak_memory)
+
+def profile_benchmark(benchmark, preset, *, top=15, line_level=False)->str:
+    """
+    cProfile report of the hot spots of one run of the benchmark, sorted by cumulative time.
+    With line_level=True and line_profiler installed, adds a line by line report of the
+    `hot_functions` attribute of the run callable (if the benchmark sets it).
+    """
+    run, _ = benchmark.setup(benchmark.sizes[preset])
+    profiler = cProfile.Profile()
+    profiler.runcall(run)
+
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(top)
+
+    if line_level:
+        try:
+            from line_profiler import LineProfiler
+        except ImportError:
+            report.write("line_profiler is not installed, skipping the line level report\n")
+        else:
+            line_profiler = LineProfiler(*getattr(run, 'hot_functions', ()))
+            line_profiler.runcall(run)
+            line_profiler.print_stats(stream=report)
+
+    return report.getvalue()
+
+def current_commit()->str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def load_history(path)->list:
+    if not os.path.exists(path):
+        return []
+    with open(path) as file:
+        return json.load(file)
+
+def append_history(path, results, commit=None)->dict:
+    """ Appends a run (the results of every benchmark) to the JSON history at `path`. """
+    history = load_history(path)
+    entry = dict(commit=commit or current_commit(),
+                 timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                 python=platform.python_version(), machine=platform.machine(), results=results)
+    history.append(entry)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(history, file, indent=1)
+    return entry
+
+def find_baseline(history, commit=None):
+    """ The last run of `commit` in the history, or the last run when commit is None. """
+    for entry in reversed(history):
+        if commit is None or entry['commit'] == commit:
+            return entry
+    return None
+
+def compare(results, baseline, *, threshold)->list:
+    """
+    Compares results to the baseline run, benchmarks are matched on (name, preset).
+    Returns a list of (result, baseline result, slowdown) where the time grew by more
+    than `threshold` (0.2 is 20% slower).
+    """
+    baseline_results = {(result['name'], result['preset']): result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        previous = baseline_results.get((result['name'], result['preset']))
+        if previous is None or previous['size'] != result['size']:
+            continue
+        slowdown = result['seconds']/previous['seconds'] - 1.0
+        if slowdown > threshold:
+            regressions.append((result, previous, slowdown))
+    return regressions
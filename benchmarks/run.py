@@ -0,0 +1,64 @@
+"""
+Runs the benchmark suite, records the results in a JSON history and fails when a
+benchmark got slower than the baseline run by more than the threshold.
+
+Run from the repository root:
+    python -m benchmarks.run [--size small|medium|large] [--filter NAME ...] [--threshold 0.25]
+                             [--baseline COMMIT] [--history PATH] [--no-save] [--profile] [--line-profile]
+"""
+import argparse
+import os
+import sys
+
+from benchmarks import suite  # registers the benchmarks
+from benchmarks.harness import BENCHMARKS, run_benchmark, profile_benchmark, load_history, append_history, find_baseline, compare
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'history.json')
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', default='small', choices=['small', 'medium', 'large'], help='problem size preset')
+    parser.add_argument('--filter', nargs='*', default=None, help='only run the benchmarks whose name contains one of these')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per benchmark, the best one is kept')
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help='JSON history of the runs')
+    parser.add_argument('--baseline', default=None, help='commit to compare against, the last run in the history by default')
+    parser.add_argument('--threshold', type=float, default=0.25, help='fail when a benchmark is slower than the baseline by more than this fraction')
+    parser.add_argument('--no-save', action='store_true', help='do not append this run to the history')
+    parser.add_argument('--profile', action='store_true', help='print a cProfile hot spot report per benchmark')
+    parser.add_argument('--line-profile', action='store_true', help='add a line level report (needs line_profiler)')
+    return parser.parse_args(argv)
+
+def main(argv=None)->int:
+    args = parse_args(argv)
+    baseline = find_baseline(load_history(args.history), args.baseline)
+    if baseline is None and args.baseline is not None:
+        # a mistyped commit must not turn the regression check off
+        print(f"baseline commit {args.baseline} is not in {args.history}", file=sys.stderr)
+        return 2
+
+    selected = [benchmark for name, benchmark in BENCHMARKS.items() if not args.filter or any(f in name for f in args.filter)]
+
+    results = []
+    for benchmark in selected:
+        result = run_benchmark(benchmark, args.size, repeat=args.repeat)
+        results.append(result)
+        print(f"{result['name']:34s} {result['parameter']}={result['size']:<9d} {result['seconds']*1e3:10.3f}ms "
+              f"{result['throughput']:14.1f}/s  peak {result['peak_memory_bytes']/2**20:8.2f}MiB")
+        if args.profile or args.line_profile:
+            print(profile_benchmark(benchmark, args.size, line_level=args.line_profile))
+
+    regressions = compare(results, baseline, threshold=args.threshold) if baseline is not None else []
+    if baseline is None:
+        print("no baseline run in the history, nothing to compare against")
+
+    if not args.no_save:
+        entry = append_history(args.history, results)
+        print(f"saved the run of commit {entry['commit']} to {args.history}")
+
+    for result, previous, slowdown in regressions:
+        print(f"REGRESSION {result['name']} ({result['preset']}): {previous['seconds']*1e3:.3f}ms -> {result['seconds']*1e3:.3f}ms "
+              f"(+{slowdown:.0%}) against commit {baseline['commit']}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
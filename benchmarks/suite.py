@@ -0,0 +1,127 @@
+""" The benchmarks of every pricing entry point, registered with benchmarks.harness. """
+import asyncio
+import os
+import subprocess
+import sys
+import numpy as np
+
+from src.python.interest_rate import InterestRate, ZeroRateCurve, ForwardRate
+from src.python.bond import Bond
+from src.python.bond_portfolio import BondPortfolio
+from src.python.analytic_solutions.vanilla_call import BlackScholesVanillaCall
+from src.python.scenarios import ScenarioEngine, ParallelShift
+from src.python.pricing_service import PricingService
+from benchmarks.data import make_zero_rates, make_bonds, make_contracts
+from benchmarks.harness import benchmark
+
+r = InterestRate(0.03, 'continuous')
+q = InterestRate(0.01, 'continuous')
+
+@benchmark('bond_price_from_zero_rates', parameter='n_bonds', sizes=dict(small=100, medium=1_000, large=10_000))
+def bond_price_from_zero_rates(n_bonds):
+    curve = ZeroRateCurve(make_zero_rates())
+    bonds = make_bonds(n_bonds)
+    run = lambda: [bond.get_bond_price_from_zero_rates(zero_rates=curve) for bond in bonds]
+    run.hot_functions = (Bond.get_bond_price_from_zero_rates, ZeroRateCurve.discount_cashflow)
+    return run, n_bonds
+
+@benchmark('bond_portfolio_prices', parameter='n_bonds', sizes=dict(small=1_000, medium=10_000, large=100_000))
+def bond_portfolio_prices(n_bonds):
+    curve = ZeroRateCurve(make_zero_rates())
+    portfolio = BondPortfolio(make_bonds(n_bonds))
+    run = lambda: portfolio.get_bond_prices_from_zero_rates(zero_rates=curve)
+    run.hot_functions = (BondPortfolio.get_bond_prices_from_zero_rates, BondPortfolio.discounted_amounts)
+    return run, n_bonds
+
+@benchmark('bond_yield', parameter='n_bonds', sizes=dict(small=20, medium=100, large=500))
+def bond_yield(n_bonds):
+    bonds = make_bonds(n_bonds)
+    prices = [bond.get_bond_price_from_yield(bond_yield=InterestRate(0.04, 'continuous')) for bond in bonds]
+    run = lambda: [bond.calculate_bond_yield(bond_price=price) for bond, price in zip(bonds, prices)]
+    run.hot_functions = (Bond.calculate_bond_yield,)
+    return run, n_bonds
+
+@benchmark('bond_portfolio_yields', parameter='n_bonds', sizes=dict(small=1_000, medium=10_000, large=100_000))
+def bond_portfolio_yields(n_bonds):
+    portfolio = BondPortfolio(make_bonds(n_bonds))
+    prices = portfolio.get_bond_prices_from_zero_rates(zero_rates=ZeroRateCurve(make_zero_rates()))
+    run = lambda: portfolio.calculate_bond_yields(bond_prices=prices)
+    run.hot_functions = (BondPortfolio.calculate_bond_yields,)
+    return run, n_bonds
+
+@benchmark('scenario_pv_matrix', parameter='n_scenarios', sizes=dict(small=100, medium=1_000, large=10_000))
+def scenario_pv_matrix(n_scenarios):
+    engine = ScenarioEngine(zero_rates=ZeroRateCurve(make_zero_rates()), portfolio=make_bonds(1_000),
+                            scenarios=ParallelShift(np.linspace(-0.02, 0.02, n_scenarios)))
+    run = lambda: engine.run(processes=1)
+    run.hot_functions = (ScenarioEngine.run,)
+    return run, n_scenarios
+
+@benchmark('forward_rate_from_zero_rates', parameter='n_points', sizes=dict(small=10, medium=100, large=1_000))
+def forward_rate_from_zero_rates(n_points):
+    curve = ZeroRateCurve(make_zero_rates(n_points))
+    times = curve.times
+    run = lambda: [ForwardRate.calculate_forward_rate_from_zero_rates(curve, t1, t2) for t1, t2 in zip(times[:-1], times[1:])]
+    run.hot_functions = (ForwardRate.calculate_forward_rate_from_zero_rates,)
+    return run, n_points - 1
+
+@benchmark('zero_rate_curve_from_arrays', parameter='n_points', sizes=dict(small=100, medium=1_000, large=10_000))
+def zero_rate_curve_from_arrays(n_points):
+    zero_rates = make_zero_rates(n_points)
+    times, rates = np.array(zero_rates.time), np.array(zero_rates.rate)
+    run = lambda: ZeroRateCurve.from_arrays(times, rates)
+    run.hot_functions = (ZeroRateCurve.from_arrays, ZeroRateCurve.update_rates)
+    return run, n_points
+
+@benchmark('curve_discount_factors', parameter='n_points', sizes=dict(small=10, medium=100, large=1_000))
+def curve_discount_factors(n_points):
+    curve = ZeroRateCurve(make_zero_rates(n_points))
+    times = np.random.default_rng(0).uniform(0.0, 35.0, 100_000)
+    run = lambda: curve.discount_factors(times)
+    return run, times.size
+
+@benchmark('vanilla_call_option_price', parameter='n_contracts', sizes=dict(small=100, medium=1_000, large=10_000))
+def vanilla_call_option_price(n_contracts):
+    contracts = make_contracts(n_contracts)
+    contracts = [dict(S=float(S), K=float(K), T=float(T), sigma=float(sigma)) for S, K, T, sigma in zip(*contracts.values())]
+    run = lambda: [BlackScholesVanillaCall.option_price(r=r, q=q, **contract) for contract in contracts]
+    run.hot_functions = (BlackScholesVanillaCall.option_price, BlackScholesVanillaCall.d_plus)
+    return run, n_contracts
+
+@benchmark('vanilla_call_price_and_greeks', parameter='n_contracts', sizes=dict(small=1_000, medium=100_000, large=1_000_000))
+def vanilla_call_price_and_greeks(n_contracts):
+    contracts = make_contracts(n_contracts)
+    run = lambda: BlackScholesVanillaCall.price_and_greeks(r=r, q=q, **contracts)
+    return run, n_contracts
+
+@benchmark('vanilla_call_implied_volatility', parameter='n_contracts', sizes=dict(small=1_000, medium=100_000, large=1_000_000))
+def vanilla_call_implied_volatility(n_contracts):
+    contracts = make_contracts(n_contracts)
+    price = BlackScholesVanillaCall.price_and_greeks(r=r, q=q, **contracts)['price']
+    del contracts['sigma']
+    run = lambda: BlackScholesVanillaCall.implied_volatility(price=price, r=r, q=q, **contracts)
+    return run, n_contracts
+
+@benchmark('pricing_service_call_requests', parameter='n_requests', sizes=dict(small=100, medium=1_000, large=10_000))
+def pricing_service_call_requests(n_requests):
+    contracts = make_contracts(4*n_requests)
+    requests = [{name: values[4*i:4*i + 4] for name, values in contracts.items()} for i in range(n_requests)]
+
+    async def serve():
+        async with PricingService(window=1e-3, max_queue_size=n_requests) as service:
+            return await asyncio.gather(*(service.price_calls(**request, r=r, q=q) for request in requests))
+
+    run = lambda: asyncio.run(serve())
+    run.hot_functions = (PricingService._price_group,)
+    return run, n_requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRICING_MODULES = ('src.python.bond', 'src.python.bond_portfolio', 'src.python.analytic_solutions.vanilla_call',
+                   'src.python.numerical_solutions.monte_carlo', 'src.python.scenarios')
+
+@benchmark('import_time', parameter='n_interpreters', sizes=dict(small=1, medium=5, large=20))
+def import_time(n_interpreters):
+    """ Start up cost of a fresh worker process: a new interpreter importing the pricing modules. """
+    command = [sys.executable, '-c', 'import ' + ', '.join(PRICING_MODULES)]
+    run = lambda: [subprocess.run(command, cwd=ROOT, check=True) for _ in range(n_interpreters)]
+    return run, n_interpreters
@@ -1,9 +1,8 @@
 import numpy as np
-from scipy.stats import norm
-from scipy.optimize import root_scalar
-import sys
-sys.path.append('../../..')
 from src.python.interest_rate import InterestRate
+from src.python.special import norm_cdf, norm_ppf, norm_pdf
+from src.python.solvers import NewtonResult
+from src.python.instrumentation import timed, count
 
 def assert_values_for_black_scholes(*, S, K, T, sigma, r, q):
     assert isinstance(r, InterestRate), 'r must be an instance of InterestRate'
@@ -13,8 +12,35 @@ def assert_values_for_black_scholes(*, S, K, T, sigma, r, q):
     assert isinstance(sigma, float) and sigma > 0.0, f'sigma must be a float greater than 0 but got {sigma:g}"'
     assert K > 0.0, f"K must be a float greater than zero but got {K}"
 
+def continuous_rate_array(rate):
+    """
+    Returns the continuously compounded rate(s) of `rate` as an array.
+    `rate` is either an InterestRate or array-like of continuous rates.
+    """
+    if isinstance(rate, InterestRate):
+        return np.asarray(rate.rate, dtype=np.float64)
+    return np.asarray(rate, dtype=np.float64)
+
+def assert_arrays_for_black_scholes(*, S, K, T, sigma, r, q):
+    """
+    Vectorized counterpart of `assert_values_for_black_scholes`, runs a single check per batch.
+    All inputs must be float64 arrays broadcastable against each other.
+    """
+    try:
+        np.broadcast_shapes(S.shape, K.shape, T.shape, sigma.shape, r.shape, q.shape)
+    except ValueError as error:
+        raise AssertionError(f'S, K, T, sigma, r and q must be broadcastable: {error}') from None
+
+    assert np.all(S > 0.0), 'S must be greater than zero'
+    assert np.all(K > 0.0), 'K must be greater than zero'
+    assert np.all(T > 0.0), 'T must be greater than zero'
+    assert np.all(sigma > 0.0), 'sigma must be greater than zero'
+    assert np.all(np.isfinite(S)) and np.all(np.isfinite(K)) and np.all(np.isfinite(T)) and np.all(np.isfinite(sigma)), 'S, K, T and sigma must be finite'
+    assert np.all(np.isfinite(r)) and np.all(np.isfinite(q)), 'r and q must be finite'
+
 class BlackScholesVanillaCall:
     @staticmethod
+    @timed
     def d_plus(*, S, K, T, sigma, r, q):
         assert_values_for_black_scholes(S=S, K=K, T=T, sigma=sigma, r=r, q=q)
         return (np.log(S/K) + (r.rate - q.rate + 0.5*sigma**2)*T) / (sigma*np.sqrt(T))
@@ -24,22 +50,179 @@ class BlackScholesVanillaCall:
         return BlackScholesVanillaCall.d_plus(S=S, K=K, T=T, sigma=sigma, r=r, q=q) - sigma*np.sqrt(T)
 
     @staticmethod
+    @timed
     def option_price(*, S, K, T, sigma, r, q):
         d_plus = BlackScholesVanillaCall.d_plus(S=S, K=K, T=T, sigma=sigma, r=r, q=q)
         d_minus = BlackScholesVanillaCall.d_minus(S=S, K=K, T=T, sigma=sigma, r=r, q=q)
 
-        return norm.cdf(d_plus) * S*np.exp(-q.rate*T)  - norm.cdf(d_minus) * K * np.exp(-r.rate*T)
+        return norm_cdf(d_plus) * S*np.exp(-q.rate*T)  - norm_cdf(d_minus) * K * np.exp(-r.rate*T)
     
     @staticmethod
+    @timed
     def delta(*, S, K, T, sigma, r, q):
         d_plus = BlackScholesVanillaCall.d_plus(S=S, K=K, T=T, sigma=sigma, r=r, q=q)
-        return norm.cdf(d_plus) * np.exp(-q.rate*T)
+        return norm_cdf(d_plus) * np.exp(-q.rate*T)
     
     @staticmethod
+    @timed
     def strike_given_delta(*, delta, S, T, sigma, r, q, tol=1e-3, **kwargs):
-        f = lambda K: BlackScholesVanillaCall.delta(S=S, K=K, T=T, sigma=sigma, r=r, q=q) - delta
-        
-        return root_scalar(f, x0=S, xtol=tol).root
+        """
+        Strike of the call with the given delta, vectorized over broadcastable arrays.
+
+        delta = exp(-qT)N(d+) is inverted in closed form for d+, so no root finding is needed
+        and `tol` is kept only for backwards compatibility. Deltas outside of (0, exp(-qT))
+        have no strike and return NaN.
+        """
+        delta = np.asarray(delta, dtype=np.float64)
+        S = np.asarray(S, dtype=np.float64)
+        T = np.asarray(T, dtype=np.float64)
+        sigma = np.asarray(sigma, dtype=np.float64)
+        r = continuous_rate_array(r)
+        q = continuous_rate_array(q)
+        assert_arrays_for_black_scholes(S=S, K=np.ones(1), T=T, sigma=sigma, r=r, q=q)
+
+        undiscounted_delta = delta*np.exp(q*T)
+        d_plus = norm_ppf(np.where((undiscounted_delta > 0.0) & (undiscounted_delta < 1.0), undiscounted_delta, np.nan))
+        return (S*np.exp(-d_plus*sigma*np.sqrt(T) + (r - q + 0.5*sigma**2)*T))[()]
+
+    @staticmethod
+    @timed
+    def implied_volatility(*, price, S, K, T, r, q, tol=1e-10, max_iter=100)->NewtonResult:
+        """
+        Implied volatility of European calls, vectorized over broadcastable arrays of quotes.
+
+        The initial guess is the Corrado-Miller approximation, refined by Newton steps on
+        log(price) with the analytic vega. Each element keeps a bracket [low, high] on the volatility and
+        falls back to bisection whenever the Newton step leaves it, so deep in/out of the
+        money quotes with a vanishing vega still converge.
+
+        Quotes outside of the no-arbitrage bounds max(S*exp(-qT) - K*exp(-rT), 0) < price < S*exp(-qT)
+        have no implied volatility and get a NaN root and converged=False.
+
+        Returns
+        -------
+        NewtonResult
+            root holds the implied volatilities with the broadcast shape of the inputs.
+        """
+        price = np.asarray(price, dtype=np.float64)
+        S = np.asarray(S, dtype=np.float64)
+        K = np.asarray(K, dtype=np.float64)
+        T = np.asarray(T, dtype=np.float64)
+        r = continuous_rate_array(r)
+        q = continuous_rate_array(q)
+        assert_arrays_for_black_scholes(S=S, K=K, T=T, sigma=np.ones(1), r=r, q=q)
+
+        shape = np.broadcast_shapes(price.shape, S.shape, K.shape, T.shape, r.shape, q.shape)
+        price, S, K, T, r, q = (np.broadcast_to(x, shape).reshape(-1) for x in (price, S, K, T, r, q))
+
+        S_discounted = S*np.exp(-q*T)
+        K_discounted = K*np.exp(-r*T)
+        sqrt_T = np.sqrt(T)
+
+        valid = (price > np.maximum(S_discounted - K_discounted, 0.0)) & (price < S_discounted)
+
+        # Corrado-Miller
+        moneyness = 0.5*(S_discounted - K_discounted)
+        with np.errstate(invalid='ignore'):
+            discriminant = np.maximum((price - moneyness)**2 - 4.0*moneyness**2/np.pi, 0.0)
+            sigma = np.sqrt(2.0*np.pi)/(S_discounted + K_discounted)*(price - moneyness + np.sqrt(discriminant))/sqrt_T
+        sigma = np.where(np.isfinite(sigma) & (sigma > 0.0), sigma, np.sqrt(2.0*np.pi/T)*price/S_discounted)
+
+        low = np.zeros_like(sigma)
+        high = np.full_like(sigma, np.inf)
+        iterations = np.zeros(sigma.size, dtype=np.int64)
+        converged = np.zeros(sigma.size, dtype=bool)
+        active = valid.copy()
+
+        for _ in range(max_iter):
+            index = np.flatnonzero(active)
+            if index.size == 0:
+                break
+
+            s, sig, st = S_discounted[index], sigma[index], sqrt_T[index]
+            d_plus = (np.log(s/K_discounted[index]) + 0.5*sig**2*T[index]) / (sig*st)
+            model_price = s*norm_cdf(d_plus) - K_discounted[index]*norm_cdf(d_plus - sig*st)
+            f = model_price - price[index]
+            vega = s*norm_pdf(d_plus)*st
+
+            low[index] = np.where(f < 0.0, sig, low[index])
+            high[index] = np.where(f > 0.0, sig, high[index])
+
+            # Newton on log(price) is far better conditioned than on the price for far out of the money quotes
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                new_sig = sig - np.log(model_price/price[index])*model_price/vega
+            outside = ~((new_sig > low[index]) & (new_sig < high[index]))
+            bisection = np.where(np.isfinite(high[index]), 0.5*(low[index] + high[index]), 2.0*sig)
+            new_sig = np.where(outside, bisection, new_sig)
+
+            sigma[index] = new_sig
+            iterations[index] += 1
+
+            done = (np.abs(new_sig - sig) < tol) | (high[index] - low[index] < tol) | (f == 0.0)
+            converged[index[done]] = True
+            active[index[done]] = False
+
+        count('BlackScholesVanillaCall.implied_volatility.iterations', int(iterations.max(initial=0)))
+        count('BlackScholesVanillaCall.implied_volatility.non_converged', int(valid.sum() - converged.sum()))
+        root = np.where(converged, sigma, np.nan).reshape(shape)
+        return NewtonResult(root=root, iterations=iterations.reshape(shape), converged=converged.reshape(shape))
+
+    @staticmethod
+    @timed
+    def price_and_greeks(*, S, K, T, sigma, r, q)->dict:
+        """
+        Batch pricing of European calls over broadcastable arrays of contracts.
+
+        d+, d-, N(d+-) and the normal pdf are evaluated once per contract and reused
+        for every output. Validation runs once per batch.
+
+        Parameters
+        ----------
+        S, K, T, sigma : array_like
+            Spot, strike, time to expiry [years] and volatility.
+        r, q : InterestRate or array_like
+            Risk free rate and dividend yield, either as InterestRate or as
+            arrays of continuously compounded rates.
+
+        Returns
+        -------
+        dict
+            Arrays of 'price', 'delta', 'gamma', 'vega', 'theta', 'rho', 'd_plus' and 'd_minus'
+            with the broadcast shape of the inputs. theta is per year and rho/vega per unit
+            change of the rate/volatility.
+        """
+        S = np.asarray(S, dtype=np.float64)
+        K = np.asarray(K, dtype=np.float64)
+        T = np.asarray(T, dtype=np.float64)
+        sigma = np.asarray(sigma, dtype=np.float64)
+        r = continuous_rate_array(r)
+        q = continuous_rate_array(q)
+        assert_arrays_for_black_scholes(S=S, K=K, T=T, sigma=sigma, r=r, q=q)
+
+        sqrt_T = np.sqrt(T)
+        sigma_sqrt_T = sigma*sqrt_T
+        d_plus = (np.log(S/K) + (r - q + 0.5*sigma**2)*T) / sigma_sqrt_T
+        d_minus = d_plus - sigma_sqrt_T
+
+        N_d_plus = norm_cdf(d_plus)
+        N_d_minus = norm_cdf(d_minus)
+        pdf_d_plus = norm_pdf(d_plus)
+
+        dividend_discount = np.exp(-q*T)
+        S_discounted = S*dividend_discount
+        K_discounted = K*np.exp(-r*T)
+        vega = S_discounted*pdf_d_plus*sqrt_T
+
+        return dict(
+            price=S_discounted*N_d_plus - K_discounted*N_d_minus,
+            delta=dividend_discount*N_d_plus,
+            gamma=dividend_discount*pdf_d_plus/(S*sigma_sqrt_T),
+            vega=vega,
+            theta=-0.5*vega*sigma/T - r*K_discounted*N_d_minus + q*S_discounted*N_d_plus,
+            rho=K_discounted*T*N_d_minus,
+            d_plus=d_plus,
+            d_minus=d_minus,
+        )
     
 if __name__ == "__main__":
     pass
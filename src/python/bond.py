@@ -2,13 +2,12 @@
 # sys.path.append('../../..')
 import numpy as np
 from typing import Callable
-from scipy.optimize import root_scalar
-from scipy.interpolate import interp1d
 
 from src.python.interest_rate import InterestRate, ZeroRate, ZeroRateCurve
 # from interest_rate import InterestRate, ZeroRate, ZeroRateCurve
 
 from src.python.cashflow import CashFlow
+from src.python.instrumentation import timed, count
 
 class Bond:
     def __init__(self,*, principal, interest_rate, coupon_frequency, time_to_maturity):
@@ -29,15 +28,18 @@ class Bond:
                                 amounts = [self.coupon]*int(self.time_to_maturity*self.coupon_frequency) + [self.principal]
                                 )
 
+    @timed
     def get_bond_price_from_zero_rates(self, *, zero_rates)->float:
         if not isinstance(zero_rates, ZeroRateCurve):
             zero_rates = ZeroRateCurve(zero_rates)
 
         return zero_rates.discount_cashflow(self.cashflow)
 
+    @timed
     def get_bond_price_from_yield(self, *, bond_yield)->float:
         return bond_yield.discount_cashflow(self.cashflow)    
         
+    @timed
     def calculate_zero_rate_at_time_of_maturity_from_bond_price(self, *, bond_price, zero_rates=None)->float:
         if zero_rates is None:
             bond_yield = self.calculate_bond_yield(bond_price=bond_price)
@@ -67,16 +69,25 @@ class Bond:
         zero_rates_discounted_coupons = zero_rates.discount_cashflow(cashflow_covered_by_zero_curve)
         f = lambda R: zero_rates_discounted_coupons + InterestRate(R, 'continuous').discount_cashflow(rest_of_cashflow) - bond_price
 
-        sol = root_scalar(f=f, x0=self.interest_rate.rate, xtol=1e-6).root
+        # scipy.optimize takes ~0.5s to import, only pay for it when a root is needed
+        from scipy.optimize import root_scalar
+        sol = root_scalar(f=f, x0=self.interest_rate.rate, xtol=1e-6)
+        count('Bond.calculate_zero_rate_at_time_of_maturity_from_bond_price.iterations', sol.iterations)
+        count('Bond.calculate_zero_rate_at_time_of_maturity_from_bond_price.function_calls', sol.function_calls)
 
-        return ZeroRate(self.time_to_maturity, sol, 'continuous')
+        return ZeroRate(self.time_to_maturity, sol.root, 'continuous')
 
+    @timed
     def calculate_bond_yield(self, *, bond_price):
         f = lambda y: InterestRate(y, 'continuous').discount_cashflow(self.cashflow) - bond_price
 
+        from scipy.optimize import root_scalar
         sol = root_scalar(f=f, x0=self.interest_rate.rate)
+        count('Bond.calculate_bond_yield.iterations', sol.iterations)
+        count('Bond.calculate_bond_yield.function_calls', sol.function_calls)
         return InterestRate(sol.root, 'continuous')
 
+    @timed
     def calculate_bond_par_yield(self, *, zero_rates=None):
         if not isinstance(zero_rates, ZeroRateCurve):
             zero_rates = ZeroRateCurve(zero_rates)
@@ -0,0 +1,111 @@
+import numpy as np
+
+from src.python.interest_rate import ZeroRateCurve
+from src.python.solvers import NewtonResult, solve_discounted_sums
+from src.python.instrumentation import timed
+
+class BondPortfolio:
+    """
+    Prices many bonds at once against a single curve.
+
+    The cashflows of all the bonds are stacked in a ragged layout: flows of bond i are
+    times[offsets[i]:offsets[i+1]] and amounts[offsets[i]:offsets[i+1]]. The curve is
+    evaluated once over the union of the cashflow dates (unique_times) and scattered
+    back to the flows with time_index.
+    """
+    def __init__(self, bonds):
+        self.bonds = list(bonds)
+        assert len(self.bonds) > 0, "BondPortfolio needs at least one bond"
+
+        lengths = np.array([len(bond.cashflow) for bond in self.bonds], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+        self.times = np.concatenate([bond.cashflow.times for bond in self.bonds])
+        self.amounts = np.concatenate([bond.cashflow.amounts for bond in self.bonds])
+        self.owner = np.repeat(np.arange(len(self.bonds)), lengths)
+        self.principals = np.array([bond.principal for bond in self.bonds], dtype=np.float64)
+        self.coupon_rates = np.array([bond.interest_rate.rate for bond in self.bonds], dtype=np.float64)
+        self.coupon_frequencies = np.array([bond.coupon_frequency for bond in self.bonds], dtype=np.int64)
+        self.times_to_maturity = np.array([bond.time_to_maturity for bond in self.bonds], dtype=np.float64)
+
+        self.unique_times, self.time_index = np.unique(self.times, return_inverse=True)
+
+    @classmethod
+    def from_arrays(cls, *, offsets, times, amounts, owner, principals, coupon_rates, coupon_frequencies,
+                    times_to_maturity, unique_times, time_index):
+        """
+        Builds the portfolio directly from its arrays (see the attributes of the same name) without
+        creating Bond objects, e.g. from memory mapped columns of a MarketDataStore. The arrays are
+        used as is, no copy is made, and `bonds` is None.
+        """
+        portfolio = cls.__new__(cls)
+        portfolio.bonds = None
+        portfolio.offsets = offsets
+        portfolio.times = times
+        portfolio.amounts = amounts
+        portfolio.owner = owner
+        portfolio.principals = principals
+        portfolio.coupon_rates = coupon_rates
+        portfolio.coupon_frequencies = coupon_frequencies
+        portfolio.times_to_maturity = times_to_maturity
+        portfolio.unique_times = unique_times
+        portfolio.time_index = time_index
+
+        n_bonds = offsets.size - 1
+        assert n_bonds > 0, "BondPortfolio needs at least one bond"
+        assert times.shape == amounts.shape == owner.shape == time_index.shape == (offsets[-1],), "flow arrays must have offsets[-1] elements"
+        assert principals.shape == coupon_rates.shape == coupon_frequencies.shape == times_to_maturity.shape == (n_bonds,), f"bond arrays must have {n_bonds} elements"
+        return portfolio
+
+    def __len__(self):
+        return self.offsets.size - 1
+
+    def discounted_amounts(self, zero_rates):
+        """ Returns the present value of every flow in the portfolio. """
+        if not isinstance(zero_rates, ZeroRateCurve):
+            zero_rates = ZeroRateCurve(zero_rates)
+
+        return self.amounts*zero_rates.discount_factors(self.unique_times)[self.time_index]
+
+    @timed
+    def get_bond_prices_from_zero_rates(self, *, zero_rates)->np.ndarray:
+        """ Returns the price of every bond in the portfolio, same as Bond.get_bond_price_from_zero_rates. """
+        return np.bincount(self.owner, weights=self.discounted_amounts(zero_rates), minlength=len(self))
+
+    def calculate_bond_yields(self, *, bond_prices, tol=1e-10, max_iter=50)->NewtonResult:
+        """
+        Continuous yields of every bond given its price, see Bond.calculate_bond_yield.
+        Bonds whose yield did not converge have a NaN root.
+        """
+        bond_prices = np.asarray(bond_prices, dtype=np.float64)
+        assert bond_prices.shape == (len(self),), f"expected {len(self)} bond prices but got shape {bond_prices.shape}"
+
+        return solve_discounted_sums(times=self.times, amounts=self.amounts, owner=self.owner,
+                                     targets=bond_prices, x0=self.coupon_rates, tol=tol, max_iter=max_iter)
+
+    def calculate_zero_rates_at_time_of_maturity_from_bond_prices(self, *, bond_prices, zero_rates=None, tol=1e-10, max_iter=50)->NewtonResult:
+        """
+        Continuous zero rates at the maturity of every bond given its price, see
+        Bond.calculate_zero_rate_at_time_of_maturity_from_bond_price.
+
+        Flows up to the end of `zero_rates` are discounted with the curve, the rest of
+        the flows of each bond are discounted at the (flat) zero rate being solved for.
+        """
+        if zero_rates is None:
+            return self.calculate_bond_yields(bond_prices=bond_prices, tol=tol, max_iter=max_iter)
+
+        if not isinstance(zero_rates, ZeroRateCurve):
+            zero_rates = ZeroRateCurve(zero_rates)
+
+        bond_prices = np.asarray(bond_prices, dtype=np.float64)
+        assert bond_prices.shape == (len(self),), f"expected {len(self)} bond prices but got shape {bond_prices.shape}"
+
+        last_time_zero_rate_curve = zero_rates.times[-1]
+        assert np.all(last_time_zero_rate_curve < self.times_to_maturity), "zero rate curve must end before the maturity of every bond"
+
+        covered = self.times <= last_time_zero_rate_curve
+        present_values = self.discounted_amounts(zero_rates)
+        covered_present_values = np.bincount(self.owner[covered], weights=present_values[covered], minlength=len(self))
+
+        rest = ~covered
+        return solve_discounted_sums(times=self.times[rest], amounts=self.amounts[rest], owner=self.owner[rest],
+                                     targets=bond_prices - covered_present_values, x0=self.coupon_rates, tol=tol, max_iter=max_iter)
@@ -0,0 +1,91 @@
+import numpy as np
+
+from src.python.interest_rate import ZeroRate, ZeroRateCurve
+from src.python.bond_portfolio import BondPortfolio
+
+class ZeroCurveBootstrapper:
+    """
+    Bootstraps a ZeroRateCurve from a strip of bonds sorted by maturity in one pass.
+
+    Every bond adds a knot at its maturity. Between knots the curve is linear in the
+    continuous zero rates and flat before the first knot, same as ZeroRateCurve, so the
+    bootstrapped curve reprices every bond.
+
+    The flows of all the bonds are split into segments (t_{k-1}, t_k] between consecutive
+    knots. Once knot k is solved the present value of every flow in segment k is final and
+    is kept in segment_present_values[bond, k], so solving a bond only needs the sum of its
+    already discounted segments plus a Newton solve over the flows of its last segment.
+    When a quote ticks only the knots from that bond onwards are solved again.
+    """
+    def __init__(self, *, bonds, bond_prices, tol=1e-12, max_iter=50):
+        self.portfolio = bonds if isinstance(bonds, BondPortfolio) else BondPortfolio(bonds)
+        self.knot_times = self.portfolio.times_to_maturity
+        assert np.all(np.diff(self.knot_times) > 0.0), "bonds must be sorted by strictly increasing maturity"
+
+        self.bond_prices = np.array(bond_prices, dtype=np.float64)
+        assert self.bond_prices.shape == (len(self.portfolio),), f"expected {len(self.portfolio)} bond prices but got shape {self.bond_prices.shape}"
+        self.tol = tol
+        self.max_iter = max_iter
+
+        n = len(self.portfolio)
+        self.zero_rates = np.full(n, np.nan)
+        self.discount_factors = np.full(n, np.nan)
+        self.segment_present_values = np.zeros((n, n))
+
+        segments = np.searchsorted(self.knot_times, self.portfolio.times, side='left')
+        self._segment_flows = [np.flatnonzero(segments == k) for k in range(n)]
+
+        self._solve_from(0)
+
+    def _segment_present_values(self, flows, k, rate):
+        """ Present values of `flows` in segment k and their derivative with respect to the rate at knot k. """
+        times = self.portfolio.times[flows]
+        if k == 0:
+            weights = np.ones_like(times)
+            previous_rate = 0.0
+        else:
+            weights = (times - self.knot_times[k-1])/(self.knot_times[k] - self.knot_times[k-1])
+            previous_rate = self.zero_rates[k-1]
+
+        present_values = self.portfolio.amounts[flows]*np.exp(-(previous_rate + (rate - previous_rate)*weights)*times)
+        return present_values, -times*weights*present_values
+
+    def _solve_knot(self, k):
+        flows = self._segment_flows[k]
+        own_flows = flows[self.portfolio.owner[flows] == k]
+        target = self.bond_prices[k] - self.segment_present_values[k, :k].sum()
+
+        rate = self.zero_rates[k-1] if k > 0 else self.portfolio.coupon_rates[k]
+        for _ in range(self.max_iter):
+            present_values, derivatives = self._segment_present_values(own_flows, k, rate)
+            step = (present_values.sum() - target)/derivatives.sum()
+            rate -= step
+            if abs(step) < self.tol:
+                break
+        else:
+            raise RuntimeError(f"bootstrapping the zero rate at t={self.knot_times[k]} did not converge")
+
+        self.zero_rates[k] = rate
+        self.discount_factors[k] = np.exp(-rate*self.knot_times[k])
+
+        present_values, _ = self._segment_present_values(flows, k, rate)
+        self.segment_present_values[:, k] = np.bincount(self.portfolio.owner[flows], weights=present_values, minlength=len(self.portfolio))
+
+    def _solve_from(self, start):
+        for k in range(start, len(self.portfolio)):
+            self._solve_knot(k)
+
+    def update_prices(self, prices):
+        """
+        Updates the quotes of some bonds, `prices` maps bond index to its new price, and
+        re-solves the curve from the first updated bond onwards.
+        """
+        if len(prices) == 0:
+            return
+        for index, price in prices.items():
+            self.bond_prices[index] = price
+        self._solve_from(min(prices))
+
+    @property
+    def curve(self)->ZeroRateCurve:
+        return ZeroRateCurve(ZeroRate(self.knot_times, self.zero_rates, 'continuous'))
@@ -1,10 +1,46 @@
 import numpy as np
 
 class CashFlow:
+    """
+    Schedule of payments stored as contiguous float64 `times` and `amounts` arrays.
+    """
+    __slots__ = ('times', 'amounts')
+
     def __init__(self, times, amounts):
-        self.times = times
-        self.amounts = amounts
+        self.times = np.ascontiguousarray(times, dtype=np.float64).reshape(-1)
+        self.amounts = np.ascontiguousarray(amounts, dtype=np.float64).reshape(-1)
+        assert self.times.shape == self.amounts.shape, f"times and amounts must have the same length but got {self.times.size} and {self.amounts.size}"
 
     def __iter__(self):
         for time, amount in zip(self.times, self.amounts):
-            yield time, amount
\ No newline at end of file
+            yield time, amount
+
+    def __len__(self):
+        return self.times.size
+
+    def __repr__(self):
+        return f"CashFlow(times={self.times!r}, amounts={self.amounts!r})"
+
+    def scale(self, factor):
+        """ Returns a cashflow with every amount multiplied by `factor`. """
+        return CashFlow(times=self.times, amounts=self.amounts*factor)
+
+    def slice(self, t_start=-np.inf, t_end=np.inf):
+        """ Returns the flows with t_start < time <= t_end. """
+        mask = (self.times > t_start) & (self.times <= t_end)
+        return CashFlow(times=self.times[mask], amounts=self.amounts[mask])
+
+    def merge(self, *others):
+        """
+        Returns a single cashflow sorted by time where flows paid at the same
+        time (in any of the cashflows) are summed into one flow.
+        """
+        flows = CashFlow.concatenate(self, *others)
+        times, inverse = np.unique(flows.times, return_inverse=True)
+        return CashFlow(times=times, amounts=np.bincount(inverse, weights=flows.amounts, minlength=times.size))
+
+    @staticmethod
+    def concatenate(*cashflows):
+        """ Returns all the flows of `cashflows` one after the other, flows are kept as is. """
+        return CashFlow(times=np.concatenate([cashflow.times for cashflow in cashflows]),
+                        amounts=np.concatenate([cashflow.amounts for cashflow in cashflows]))
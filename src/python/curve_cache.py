@@ -0,0 +1,62 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from src.python.instrumentation import count
+
+class DiscountFactorCache:
+    """
+    Bounded LRU cache of discount factors keyed on the time grid they are evaluated at.
+
+    Entries are only valid for the interpolator they were computed with: the cache is
+    cleared as soon as it is asked for discount factors of a different interpolator, so
+    rebuilding a curve (new rates) invalidates it without any bookkeeping from the caller.
+    Cached arrays are read only since they are handed out to every caller of the grid.
+    """
+    def __init__(self, maxsize=128):
+        assert isinstance(maxsize, int) and maxsize > 0, f"maxsize must be a positive int but got {maxsize}"
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._interpolator = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def discount_factors(self, interpolator, times):
+        if interpolator is not self._interpolator:
+            if self._interpolator is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self._interpolator = interpolator
+
+        times = np.asarray(times, dtype=np.float64)
+        key = (times.shape, times.tobytes())
+
+        discount_factors = self._entries.get(key)
+        if discount_factors is not None:
+            self.hits += 1
+            count('DiscountFactorCache.hits')
+            self._entries.move_to_end(key)
+            return discount_factors[()]
+
+        self.misses += 1
+        count('DiscountFactorCache.misses')
+        discount_factors = np.asarray(interpolator.discount_factors(times))
+        discount_factors.setflags(write=False)
+        self._entries[key] = discount_factors
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return discount_factors[()]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self)->dict:
+        lookups = self.hits + self.misses
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions, invalidations=self.invalidations,
+                    size=len(self._entries), maxsize=self.maxsize, hit_rate=self.hits/lookups if lookups else 0.0)
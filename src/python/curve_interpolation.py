@@ -0,0 +1,232 @@
+import numpy as np
+
+class CurveInterpolator:
+    """
+    Evaluation kernel of a curve of continuously compounded zero rates given at knot times.
+
+    Everything that depends only on the knots (slopes, forwards, ...) is precomputed once,
+    so evaluating a whole array of times is a searchsorted plus a few array expressions.
+    Beyond the last knot the zero rate is flat. Scalars in give scalars out.
+    """
+    # whether r(t)*t is linear in the knot rates, i.e. rate_time_weights is available
+    rate_times_linear_in_rates = False
+
+    def __init__(self, times, rates):
+        self.times = np.asarray(times, dtype=np.float64)
+        self.rates = np.asarray(rates, dtype=np.float64)
+        assert self.times.ndim == 1 and self.times.size > 0, "curve needs at least one knot"
+        assert self.times.shape == self.rates.shape, f"times and rates must have the same length but got {self.times.size} and {self.rates.size}"
+        assert np.all(np.diff(self.times) > 0.0), "knot times must be strictly increasing"
+
+    def zero_rates(self, t):
+        t = np.asarray(t, dtype=np.float64)
+        return self._zero_rates(t)[()]
+
+    def discount_factors(self, t):
+        t = np.asarray(t, dtype=np.float64)
+        return np.exp(-self._zero_rates(t)*t)[()]
+
+    def instantaneous_forwards(self, t):
+        t = np.asarray(t, dtype=np.float64)
+        return self._instantaneous_forwards(t)[()]
+
+    __call__ = zero_rates
+
+    def rate_time_weights(self, t):
+        """
+        For schemes where r(t)*t is linear in the knot rates (rate_times_linear_in_rates), returns (i0, w0, i1, w1) with
+        r(t)*t = w0*rates[i0] + w1*rates[i1] for every t, so a bump h of the rate at knot k
+        multiplies the discount factor at t by exp(-h*(w0*(i0==k) + w1*(i1==k))).
+        """
+        raise NotImplementedError(f"r(t)*t is not linear in the knot rates for {type(self).__name__}")
+
+    def _knot_weights(self, t):
+        """ Knots around t and the position x of t between them (x = 0 outside of the knots). """
+        n = self.times.size
+        i = np.searchsorted(self.times, t, side='right')
+        i0 = np.clip(i - 1, 0, n - 1)
+        i1 = np.clip(i, 0, n - 1)
+        inside = (i > 0) & (i < n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.where(inside, (t - self.times[i0])/(self.times[i1] - self.times[i0]), 0.0)
+        return i0, i1, x, inside
+
+    def _zero_rates(self, t):
+        raise NotImplementedError
+
+    def _instantaneous_forwards(self, t):
+        raise NotImplementedError
+
+class LinearZeroRateInterpolator(CurveInterpolator):
+    """ Linear in the zero rates, flat before the first and after the last knot. """
+    rate_times_linear_in_rates = True
+
+    def __init__(self, times, rates):
+        super().__init__(times, rates)
+        self.slopes = np.diff(self.rates)/np.diff(self.times)
+
+        # r(t) = intercepts[i] + gradients[i]*t on the i-th interval of searchsorted(times, t, 'right'),
+        # the two outer intervals are the flat extrapolations
+        self.gradients = np.concatenate([[0.0], self.slopes, [0.0]])
+        self.intercepts = np.concatenate([[self.rates[0]], self.rates[:-1] - self.slopes*self.times[:-1], [self.rates[-1]]])
+
+    def _zero_rates(self, t):
+        i = np.searchsorted(self.times, t, side='right')
+        return self.intercepts[i] + self.gradients[i]*t
+
+    def rate_time_weights(self, t):
+        t = np.asarray(t, dtype=np.float64)
+        i0, i1, x, _ = self._knot_weights(t)
+        return i0, (1.0 - x)*t, i1, x*t
+
+    def _instantaneous_forwards(self, t):
+        # f(t) = d(r(t)t)/dt = r(t) + t*r'(t)
+        i = np.searchsorted(self.times, t, side='right')
+        return self.intercepts[i] + 2.0*self.gradients[i]*t
+
+class _ForwardCurveInterpolator(CurveInterpolator):
+    """
+    Base for schemes defined through the forward curve on [0, last knot]: keeps the nodes
+    (0 and the knot times) with r*t = -log(discount factor) and the discrete forwards
+    between nodes.
+    """
+    def __init__(self, times, rates):
+        super().__init__(times, rates)
+        assert self.times[0] >= 0.0, "knot times must not be negative"
+
+        if self.times[0] > 0.0:
+            self.nodes = np.concatenate([[0.0], self.times])
+            self.rate_times = np.concatenate([[0.0], self.rates*self.times])
+        else:
+            self.nodes = self.times
+            self.rate_times = self.rates*self.times
+        self.discrete_forwards = np.diff(self.rate_times)/np.diff(self.nodes)
+
+    def _interval(self, t):
+        i = np.clip(np.searchsorted(self.nodes, t, side='right') - 1, 0, self.discrete_forwards.size - 1)
+        return i, (t - self.nodes[i])/(self.nodes[i+1] - self.nodes[i])
+
+    def discount_factors(self, t):
+        t = np.asarray(t, dtype=np.float64)
+        rate_times = np.where(t > self.times[-1], self.rates[-1]*t, self._rate_times(np.minimum(t, self.times[-1])))
+        return np.exp(-rate_times)[()]
+
+    def _zero_rates(self, t):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zero_rates = self._rate_times(np.minimum(t, self.times[-1]))/t
+        if np.any(t == 0.0):
+            zero_rates = np.where(t == 0.0, self._instantaneous_forwards(np.zeros(1))[0], zero_rates)
+        return np.where(t >= self.times[-1], self.rates[-1], zero_rates)
+
+class LogLinearDiscountInterpolator(_ForwardCurveInterpolator):
+    """ Linear in log(discount factor), i.e. piecewise flat instantaneous forwards. """
+    rate_times_linear_in_rates = True
+
+    def rate_time_weights(self, t):
+        t = np.asarray(t, dtype=np.float64)
+        i0, i1, x, inside = self._knot_weights(t)
+        # outside of the knots the zero rate is flat at the first (last) knot rate
+        return i0, np.where(inside, (1.0 - x)*self.times[i0], t), i1, x*self.times[i1]
+
+    def _rate_times(self, t):
+        i, x = self._interval(t)
+        return self.rate_times[i] + x*(self.rate_times[i+1] - self.rate_times[i])
+
+    def _instantaneous_forwards(self, t):
+        i, _ = self._interval(t)
+        return np.where(t > self.times[-1], self.rates[-1], self.discrete_forwards[i])
+
+class MonotoneConvexInterpolator(_ForwardCurveInterpolator):
+    """
+    Hagan-West monotone convex interpolation of the instantaneous forwards (without the
+    positivity collar). The forwards are continuous, keep the monotonicity of the discrete
+    forwards and integrate back to the knot zero rates.
+    """
+    def __init__(self, times, rates):
+        super().__init__(times, rates)
+
+        fd = self.discrete_forwards
+        dt = np.diff(self.nodes)
+        forwards = np.empty(fd.size + 1)
+        if fd.size == 1:
+            forwards[:] = fd[0]
+        else:
+            forwards[1:-1] = (dt[:-1]*fd[1:] + dt[1:]*fd[:-1])/(dt[:-1] + dt[1:])
+            forwards[0] = fd[0] - 0.5*(forwards[1] - fd[0])
+            forwards[-1] = fd[-1] - 0.5*(forwards[-2] - fd[-1])
+
+        g0 = forwards[:-1] - fd
+        g1 = forwards[1:] - fd
+        self.g0 = g0
+        self.g1 = g1
+
+        zone_1 = ((g0 < 0.0) & (-0.5*g0 <= g1) & (g1 <= -2.0*g0)) | ((g0 > 0.0) & (-0.5*g0 >= g1) & (g1 >= -2.0*g0))
+        # a forward equal to the discrete forward at one end (e.g. two equal neighbouring discrete
+        # forwards) is the eta = 1 limit of zone 2 (g0 == 0) or the eta = 0 limit of zone 3 (g1 == 0)
+        zone_2 = ((g0 < 0.0) & (g1 > -2.0*g0)) | ((g0 > 0.0) & (g1 < -2.0*g0)) | ((g0 == 0.0) & (g1 != 0.0))
+        zone_3 = ((g0 > 0.0) & (0.0 > g1) & (g1 > -0.5*g0)) | ((g0 < 0.0) & (0.0 < g1) & (g1 < -0.5*g0)) | ((g1 == 0.0) & (g0 != 0.0))
+        flat = (g0 == 0.0) & (g1 == 0.0)
+        self.zone = np.select([flat, zone_1, zone_2, zone_3], [0, 1, 2, 3], default=4)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.eta = np.select([self.zone == 2, self.zone == 3, self.zone == 4],
+                                 [(g1 + 2.0*g0)/(g1 - g0), 3.0*g1/(g1 - g0), g1/(g1 + g0)], default=0.0)
+            self.A = np.where(self.zone == 4, -g0*g1/(g0 + g1), 0.0)
+
+    def _g(self, t):
+        """ Returns the interval, x and g(x), G(x) = int_0^x g, the deviation of the forward from the discrete forward. """
+        i, x = self._interval(t)
+        x = np.clip(x, 0.0, 1.0)
+        g0, g1, eta, A, zone = self.g0[i], self.g1[i], self.eta[i], self.A[i], self.zone[i]
+
+        g = np.zeros_like(x)
+        G = np.zeros_like(x)
+        before = np.maximum(eta - x, 0.0)
+        after = np.maximum(x - eta, 0.0)
+        # before/eta and after/(1 - eta) in [0, 1], 0 in the eta = 0 and eta = 1 limits
+        u = np.divide(before, eta, out=np.zeros_like(x), where=eta > 0.0)
+        v = np.divide(after, 1.0 - eta, out=np.zeros_like(x), where=eta < 1.0)
+
+        # zone 1
+        z = zone == 1
+        g = np.where(z, g0*(1.0 - 4.0*x + 3.0*x**2) + g1*(-2.0*x + 3.0*x**2), g)
+        G = np.where(z, g0*(x - 2.0*x**2 + x**3) + g1*(-x**2 + x**3), G)
+
+        # zone 2, flat at g0 until eta
+        z = zone == 2
+        g = np.where(z, g0 + (g1 - g0)*v**2, g)
+        G = np.where(z, g0*x + (g1 - g0)*after*v**2/3.0, G)
+
+        # zone 3, flat at g1 after eta
+        z = zone == 3
+        g = np.where(z, g1 + (g0 - g1)*u**2, g)
+        G = np.where(z, g1*x + (g0 - g1)*(eta - before*u**2)/3.0, G)
+
+        # zone 4, minimum (maximum) A at eta
+        z = zone == 4
+        g = np.where(z, np.where(x <= eta, A + (g0 - A)*u**2, A + (g1 - A)*v**2), g)
+        G = np.where(z, A*x + (g0 - A)*(eta - before*u**2)/3.0 + (g1 - A)*after*v**2/3.0, G)
+
+        return i, x, g, G
+
+    def _rate_times(self, t):
+        i, x, _, G = self._g(t)
+        dt = self.nodes[i+1] - self.nodes[i]
+        return self.rate_times[i] + dt*(self.discrete_forwards[i]*x + G)
+
+    def _instantaneous_forwards(self, t):
+        i, _, g, _ = self._g(t)
+        return np.where(t > self.times[-1], self.rates[-1], self.discrete_forwards[i] + g)
+
+INTERPOLATORS = {
+    'linear': LinearZeroRateInterpolator,
+    'log_linear_discount': LogLinearDiscountInterpolator,
+    'monotone_convex': MonotoneConvexInterpolator,
+}
+
+def make_interpolator(interpolation, times, rates)->CurveInterpolator:
+    """ `interpolation` is one of the keys of INTERPOLATORS or a CurveInterpolator subclass. """
+    if isinstance(interpolation, str):
+        assert interpolation in INTERPOLATORS, f"interpolation must be one of {list(INTERPOLATORS)} but got {interpolation!r}"
+        interpolation = INTERPOLATORS[interpolation]
+    return interpolation(times, rates)
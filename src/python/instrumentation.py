@@ -0,0 +1,85 @@
+"""
+Lightweight instrumentation of the pricing hot paths: call counts and inclusive wall time
+per entry point, plus named counters (solver iterations, curve builds, cache hits, ...).
+
+Disabled by default, enable it with enable() or by setting PYBIND_FINANCE_INSTRUMENTATION=1.
+When disabled an instrumented function costs a single flag check and count() returns
+immediately, nothing is recorded.
+
+    from src.python import instrumentation
+    with instrumentation.recording():
+        bond.calculate_bond_yield(bond_price=104.0)
+    instrumentation.snapshot()
+"""
+import functools
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+class _State:
+    enabled = os.environ.get('PYBIND_FINANCE_INSTRUMENTATION', '') not in ('', '0')
+
+_state = _State()
+_counters = defaultdict(int)
+_calls = defaultdict(int)
+_seconds = defaultdict(float)
+
+def enable():
+    _state.enabled = True
+
+def disable():
+    _state.enabled = False
+
+def is_enabled()->bool:
+    return _state.enabled
+
+def reset():
+    _counters.clear()
+    _calls.clear()
+    _seconds.clear()
+
+@contextmanager
+def recording(reset_stats=True):
+    """ Enables the instrumentation inside the block, restoring the previous state after it. """
+    previous = _state.enabled
+    if reset_stats:
+        reset()
+    _state.enabled = True
+    try:
+        yield
+    finally:
+        _state.enabled = previous
+
+def count(name, n=1):
+    """ Adds n to the counter `name`. """
+    if _state.enabled:
+        _counters[name] += n
+
+def timed(func):
+    """ Counts the calls of func and accumulates their wall time under func.__qualname__. """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _state.enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _seconds[name] += time.perf_counter() - start
+            _calls[name] += 1
+
+    return wrapper
+
+def snapshot()->dict:
+    """
+    Returns a copy of the statistics:
+    {'timers': {entry point: {'calls': int, 'seconds': float}}, 'counters': {name: int}}.
+    Times are inclusive, a timed function calling another timed function counts in both.
+    """
+    return dict(
+        timers={name: dict(calls=_calls[name], seconds=_seconds[name]) for name in _calls},
+        counters=dict(_counters),
+    )
@@ -1,20 +1,66 @@
 import numpy as np
-from scipy.interpolate import interp1d
 from src.python.cashflow import CashFlow
+from src.python.curve_interpolation import make_interpolator
+from src.python.curve_cache import DiscountFactorCache
+from src.python.instrumentation import timed, count
+
+def _frozen(value, copy=True):
+    """
+    Scalars are kept as is, anything else becomes a read only contiguous float64 array. With
+    copy=False a buffer that is already contiguous float64 is shared with the caller (read only
+    view) instead of copied, the caller must then leave it unchanged.
+    """
+    if np.ndim(value) == 0:
+        return value
+    value = np.array(value, dtype=np.float64, order='C') if copy else np.ascontiguousarray(value, dtype=np.float64).view()
+    value.setflags(write=False)
+    return value
 
 class InterestRate:
-    def __init__(self, rate, compounding_frequency):
-        # save interest rate as continuous
-        self.rate = InterestRate.change_interest_frequency(r1=rate, m1=compounding_frequency, m2="continuous")
+    """
+    Immutable interest rate, stored as continuously compounded. `rate` is a scalar or an
+    array (a whole column of rates in one object). Conversions to other compounding
+    frequencies are computed once per frequency and cached. Array rates are copied unless
+    copy=False, see ZeroRateCurve.from_arrays.
+    """
+    __slots__ = ('rate', '_conversions')
+
+    def __init__(self, rate, compounding_frequency, *, copy=True):
+        # save interest rate as continuous, a conversion is a new array that needs no extra copy
+        rate = _frozen(rate, copy=copy and compounding_frequency == "continuous")
+        continuous_rate = _frozen(InterestRate.change_interest_frequency(r1=rate, m1=compounding_frequency, m2="continuous"), copy=False)
+        object.__setattr__(self, 'rate', continuous_rate)
+        object.__setattr__(self, '_conversions', {'continuous': continuous_rate})
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __setstate__(self, state):
+        _, slots = state
+        for name, value in slots.items():
+            object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(rate={self.rate!r}, compounding_frequency='continuous')"
 
     def __call__(self, compounding_frequency='continuous'):
-        return InterestRate.change_interest_frequency(r1=self.rate, m1="continuous", m2=compounding_frequency)
-    
+        try:
+            return self._conversions[compounding_frequency]
+        except KeyError:
+            converted = _frozen(InterestRate.change_interest_frequency(r1=self.rate, m1="continuous", m2=compounding_frequency), copy=False)
+            self._conversions[compounding_frequency] = converted
+            return converted
+
     def discount(self, time, value):
         return value*np.exp(-self.rate*time)
-    
+
+    @timed
     def discount_cashflow(self, cashflow: CashFlow):
-        return np.sum([amount*np.exp(-self.rate*time) for (time, amount) in cashflow])
+        # one present value per rate when the rate is an array
+        return np.exp(-np.multiply.outer(self.rate, cashflow.times)) @ cashflow.amounts
 
     @staticmethod
     def change_interest_frequency(*, r1:float, m1:int|str, m2:int|str)->float:
@@ -50,38 +96,120 @@ class InterestRate:
         return m2*((1.0 + r1/m1)**(m1/m2) - 1.0)
     
 class InterestRateCurve:
-    def __init__(self, times, interest_rates):
+    def __init__(self, times, interest_rates, interpolation='linear'):
         self.times = times
+        # interpolation is 'linear' (zero rates), 'log_linear_discount', 'monotone_convex' or a CurveInterpolator subclass
+        self.interpolation = interpolation
+        self.cache = None
+        self.update_rates(interest_rates)
+
+    @timed
+    def update_rates(self, interest_rates):
+        """
+        Replaces the rates at the curve times, a sequence of InterestRate or a single InterestRate
+        holding an array of rates. Discount factors cached for the old rates are dropped.
+        """
         self.interest_rates = interest_rates
-        self.continuous_rates = [r.rate for r in self.interest_rates]
+        if isinstance(interest_rates, InterestRate):
+            self.continuous_rates = interest_rates.rate
+        else:
+            self.continuous_rates = [r.rate for r in self.interest_rates]
 
-        self.curve = interp1d(x=self.times, y=self.continuous_rates, kind="linear", bounds_error=False, fill_value=(self.continuous_rates[0], self.continuous_rates[-1]))
-    
+        self.interpolator = make_interpolator(self.interpolation, self.times, self.continuous_rates)
+        count('InterestRateCurve.builds')
+        # zero rate as a function of time
+        self.curve = self.interpolator.zero_rates
+
+    def enable_cache(self, maxsize=128):
+        """
+        Memoizes discount_factors (and so discount_cashflow) per distinct time grid, keeping the
+        `maxsize` most recently used grids. Useful when many cashflows share the same schedule.
+        """
+        self.cache = DiscountFactorCache(maxsize)
+
+    def disable_cache(self):
+        self.cache = None
+
+    def cache_stats(self)->dict:
+        """ hits, misses, evictions, invalidations, size, maxsize and hit_rate of the cache, None if disabled. """
+        return None if self.cache is None else self.cache.stats()
+
+    def zero_rates(self, times):
+        return self.interpolator.zero_rates(times)
+
+    def discount_factors(self, times):
+        if self.cache is not None:
+            return self.cache.discount_factors(self.interpolator, times)
+        return self.interpolator.discount_factors(times)
+
+    def instantaneous_forwards(self, times):
+        return self.interpolator.instantaneous_forwards(times)
+
+    @timed
     def discount_cashflow(self, cashflow: CashFlow):
-        return np.sum([amount*np.exp(-self.curve(time)*time) for (time, amount) in cashflow])
+        return np.dot(cashflow.amounts, self.discount_factors(cashflow.times))
     
-class ZeroRate(InterestRate): 
-    def __init__(self, time, rate, compounding_frequency):
-        super().__init__(rate, compounding_frequency)
-        self.time = time
+class ZeroRate(InterestRate):
+    """ Zero rate(s) for time(s) `time`, time and rate may be arrays of the same shape. """
+    __slots__ = ('time',)
+
+    def __init__(self, time, rate, compounding_frequency, *, copy=True):
+        super().__init__(rate, compounding_frequency, copy=copy)
+        object.__setattr__(self, 'time', _frozen(time, copy=copy))
+        assert np.shape(self.time) == np.shape(self.rate), f"time and rate must have the same shape but got {np.shape(self.time)} and {np.shape(self.rate)}"
+
+    def __repr__(self):
+        return f"ZeroRate(time={self.time!r}, rate={self.rate!r}, compounding_frequency='continuous')"
 
 class ZeroRateCurve(InterestRateCurve):
-    def __init__(self, zero_rates):
+    """ zero_rates is a sequence of ZeroRate or a single ZeroRate holding arrays of times and rates. """
+    def __init__(self, zero_rates, interpolation='linear'):
+        super().__init__(ZeroRateCurve._times(zero_rates), zero_rates, interpolation)
+
+    @classmethod
+    def from_arrays(cls, times, rates, compounding_frequency='continuous', interpolation='linear'):
+        """
+        Builds the curve from columnar `times` and `rates` without a ZeroRate per point.
+        Contiguous float64 inputs are shared with the caller (read only views, no copy, continuous
+        rates only), so the caller must not modify the buffers while the curve is in use.
+        """
+        zero_rates = ZeroRate(times, rates, compounding_frequency, copy=False)
+        assert np.ndim(zero_rates.time) == 1, f"times must be one dimensional but got shape {np.shape(zero_rates.time)}"
+        assert np.isfinite(zero_rates.time).all() and np.isfinite(zero_rates.rate).all(), "times and rates must be finite"
+        return cls(zero_rates, interpolation)
+
+    @staticmethod
+    def _times(zero_rates):
+        if isinstance(zero_rates, ZeroRate):
+            assert np.ndim(zero_rates.time) == 1, "a single ZeroRate must hold an array of times"
+            return zero_rates.time
         for rate in zero_rates: assert isinstance(rate, ZeroRate), f"All zero rates must be ZeroRate instances and got {type(rate)} val={rate}"
-        times = [rate.time for rate in zero_rates]
-        super().__init__(times, zero_rates)
+        return [rate.time for rate in zero_rates]
+
+    def update_rates(self, zero_rates):
+        assert np.array_equal(ZeroRateCurve._times(zero_rates), self.times), "zero rates must be given at the times of the curve"
+        super().update_rates(zero_rates)
 
 class ForwardRate(InterestRate):
+    """ Forward rate(s) between t1 and t2, which may be arrays broadcastable with the rate. """
+    __slots__ = ('t1', 't2')
+
     def __init__(self, rate, compounding_frequency, t1, t2):
         super().__init__(rate, compounding_frequency)
 
-        self.t1 = t1
-        self.t2 = t2
+        object.__setattr__(self, 't1', _frozen(t1))
+        object.__setattr__(self, 't2', _frozen(t2))
+
+    def __repr__(self):
+        return f"ForwardRate(rate={self.rate!r}, compounding_frequency='continuous', t1={self.t1!r}, t2={self.t2!r})"
 
     @staticmethod
+    @timed
     def calculate_forward_rate_from_zero_rates(zero_rates, t1, t2, compounding_frequency='continuous'):
         if not isinstance(zero_rates, ZeroRateCurve):
             zero_rates = ZeroRateCurve(zero_rates)
 
-        forward_rate = (zero_rates.curve(t2)*t2 - zero_rates.curve(t1)*t1) / (t2- t1)
+        times = np.stack(np.broadcast_arrays(np.asarray(t1, dtype=np.float64), np.asarray(t2, dtype=np.float64)))
+        r1, r2 = zero_rates.zero_rates(times)
+        forward_rate = (r2*t2 - r1*t1) / (t2- t1)
         return ForwardRate(rate=forward_rate, compounding_frequency=compounding_frequency, t1=t1, t2=t2)
@@ -0,0 +1,173 @@
+import numpy as np
+
+from src.python.analytic_solutions.vanilla_call import assert_values_for_black_scholes
+
+def factor_tridiagonal(lower, diagonal, upper):
+    """
+    LU factorization of a tridiagonal A (LAPACK gttrf, partial pivoting), done once and
+    reused by solve_factored_tridiagonal for every right hand side.
+
+    Parameters
+    ----------
+    lower, diagonal, upper : np.ndarray
+        Sub, main and super diagonal of A indexed by row (lower[0] and upper[-1] are not
+        used) of shape (n,), or (n, m) for m different matrices solved side by side. The
+        m matrices are factored as one block diagonal system of n*m rows.
+
+    Returns
+    -------
+    tuple
+        (shape, dl, d, du, du2, ipiv), the shape of the diagonals and the factors of A.
+    """
+    # scipy.linalg takes ~0.2s to import, only pay for it when a grid is solved
+    from scipy.linalg.lapack import dgttrf
+
+    shape = np.broadcast_shapes(np.shape(lower), np.shape(diagonal), np.shape(upper))
+    lower, diagonal, upper = (np.broadcast_to(a, shape) for a in (lower, diagonal, upper))
+    if len(shape) == 2:
+        # column k of the diagonals is block k, the blocks are not coupled
+        lower, upper = lower.copy(), upper.copy()
+        lower[0], upper[-1] = 0.0, 0.0
+        lower, diagonal, upper = (a.T.reshape(-1) for a in (lower, diagonal, upper))
+
+    dl, d, du, du2, ipiv, info = dgttrf(lower[1:], diagonal, upper[:-1])
+    assert info == 0, f"the tridiagonal matrix is singular, zero pivot at row {info - 1}"
+    return shape, dl, d, du, du2, ipiv
+
+def solve_factored_tridiagonal(factors, rhs):
+    """
+    Forward and back substitution (LAPACK gttrs) of the factors of factor_tridiagonal.
+    rhs is (n,) or (n, m): every column is a separate system, solved with the column of
+    the factors when they have one.
+    """
+    from scipy.linalg.lapack import dgttrs
+
+    shape, dl, d, du, du2, ipiv = factors
+    rhs = np.asarray(rhs, dtype=np.float64)
+    if len(shape) == 1:
+        x, info = dgttrs(dl, d, du, du2, ipiv, rhs.reshape(shape[0], -1))
+        return x.reshape(rhs.shape)
+
+    n, m = shape
+    out_shape = np.broadcast_shapes(rhs.shape if rhs.ndim == 2 else rhs.shape + (1,), shape)
+    b = np.broadcast_to(rhs if rhs.ndim == 2 else rhs[:, None], out_shape).T.reshape(-1, 1)
+    x, info = dgttrs(dl, d, du, du2, ipiv, b)
+    return x.reshape(m, n).T
+
+def solve_tridiagonal(lower, diagonal, upper, rhs):
+    """ Solves A x = rhs for a tridiagonal A, see factor_tridiagonal. """
+    return solve_factored_tridiagonal(factor_tridiagonal(lower, diagonal, upper), rhs)
+
+class CrankNicolsonVanillaOption:
+    """
+    Crank-Nicolson finite difference solver of the Black-Scholes PDE for European and
+    American calls and puts with a dividend yield, on a uniform grid in S.
+
+    Many strikes are priced at once on a shared grid, every strike is an extra column of
+    the tridiagonal solves. The early exercise constraint V >= payoff is enforced with the
+    penalty method of Forsyth and Vetzal. The first `rannacher_steps` time steps are fully
+    implicit to damp the oscillations coming from the kink of the payoff, which keeps delta
+    and gamma, read directly from the grid, smooth.
+    """
+    def __init__(self, *, S, K, T, sigma, r, q, option_type='call', american=True,
+                 n_space=200, n_time=200, s_max_multiplier=4.0, rannacher_steps=2, penalty=1e8, max_penalty_iterations=50):
+        assert option_type in ('call', 'put'), f"option_type must be 'call' or 'put' but got {option_type!r}"
+        self.K = np.atleast_1d(np.asarray(K, dtype=np.float64))
+        for K_i in self.K:
+            assert_values_for_black_scholes(S=S, K=K_i, T=T, sigma=sigma, r=r, q=q)
+        assert n_space >= 4 and n_time >= 1, "grid needs at least 4 space and 1 time steps"
+
+        self.S = S
+        self.T = T
+        self.sigma = sigma
+        self.r = r
+        self.q = q
+        self.option_type = option_type
+        self.american = american
+        self.n_time = n_time
+        self.rannacher_steps = rannacher_steps
+        self.penalty = penalty
+        self.max_penalty_iterations = max_penalty_iterations
+
+        # S lies exactly on the node spot_index
+        s_max = s_max_multiplier*max(S, self.K.max())
+        self.spot_index = max(2, int(round(n_space*S/s_max)))
+        self.dS = S/self.spot_index
+        self.grid = self.dS*np.arange(n_space + 1)
+        self.values = None
+
+    def payoff(self):
+        if self.option_type == 'call':
+            return np.maximum(self.grid[:, None] - self.K, 0.0)
+        return np.maximum(self.K - self.grid[:, None], 0.0)
+
+    def boundaries(self, tau):
+        """ Values at S=0 and S=S_max at time to expiry tau. """
+        r, q = self.r.rate, self.q.rate
+        s_max = self.grid[-1]
+        zero = np.zeros_like(self.K)
+        if self.option_type == 'call':
+            upper = s_max*np.exp(-q*tau) - self.K*np.exp(-r*tau)
+            return zero, np.maximum(upper, s_max - self.K) if self.american else upper
+        lower = self.K if self.american else self.K*np.exp(-r*tau)
+        return lower, zero
+
+    def solve(self)->dict:
+        """
+        Returns a dict of arrays over the strikes with the 'price', 'delta' and 'gamma' at S.
+        The grid values at t=0 are kept in self.values, of shape (nodes, strikes).
+        """
+        r, q, sigma = self.r.rate, self.q.rate, self.sigma
+        dt = self.T/self.n_time
+
+        i = np.arange(1, self.grid.size - 1, dtype=np.float64)
+        diffusion = 0.5*sigma**2*i**2
+        drift = 0.5*(r - q)*i
+        a = diffusion - drift
+        b = -2.0*diffusion - r
+        c = diffusion + drift
+
+        payoff = self.payoff()
+        exercise = payoff[1:-1]
+        V = payoff.copy()
+        active = np.zeros_like(exercise, dtype=bool)
+        factors = {}
+
+        for step in range(self.n_time):
+            theta = 1.0 if step < self.rannacher_steps else 0.5
+            tau = (step + 1)*dt
+            lower_boundary, upper_boundary = self.boundaries(tau)
+
+            explicit = V[1:-1] + (1.0 - theta)*dt*(a[:, None]*V[:-2] + b[:, None]*V[1:-1] + c[:, None]*V[2:])
+            explicit[0] += theta*dt*a[0]*lower_boundary
+            explicit[-1] += theta*dt*c[-1]*upper_boundary
+
+            lower, diagonal, upper = -theta*dt*a, 1.0 - theta*dt*b, -theta*dt*c
+            if not self.american:
+                if theta not in factors:
+                    factors[theta] = factor_tridiagonal(lower, diagonal, upper)
+                interior = solve_factored_tridiagonal(factors[theta], explicit)
+            else:
+                # the exercise region moves little between steps, start from the last one and
+                # factor the penalized matrices again only when it (or theta) changes
+                for _ in range(self.max_penalty_iterations):
+                    penalty = np.where(active, self.penalty, 0.0)
+                    if theta not in factors:
+                        factors = {theta: factor_tridiagonal(lower[:, None], diagonal[:, None] + penalty, upper[:, None])}
+                    interior = solve_factored_tridiagonal(factors[theta], explicit + penalty*exercise)
+                    new_active = interior < exercise
+                    if np.array_equal(new_active, active):
+                        break
+                    active = new_active
+                    factors = {}
+
+            V[0], V[-1] = lower_boundary, upper_boundary
+            V[1:-1] = interior
+
+        self.values = V
+        j = self.spot_index
+        return dict(
+            price=V[j],
+            delta=(V[j+1] - V[j-1])/(2.0*self.dS),
+            gamma=(V[j+1] - 2.0*V[j] + V[j-1])/self.dS**2,
+        )
@@ -0,0 +1,175 @@
+import os
+
+import numpy as np
+
+from src.python.analytic_solutions.vanilla_call import BlackScholesVanillaCall, assert_values_for_black_scholes
+
+class VanillaCallPayoff:
+    def __init__(self, K):
+        self.K = K
+
+    def __call__(self, paths):
+        return np.maximum(paths[:, -1] - self.K, 0.0)
+
+class VanillaPutPayoff:
+    def __init__(self, K):
+        self.K = K
+
+    def __call__(self, paths):
+        return np.maximum(self.K - paths[:, -1], 0.0)
+
+class MonteCarloResult:
+    __slots__ = ('price', 'standard_error', 'n_paths')
+
+    def __init__(self, price, standard_error, n_paths):
+        self.price = price
+        self.standard_error = standard_error
+        self.n_paths = n_paths
+
+    def __repr__(self):
+        return f"MonteCarloResult(price={self.price:.6g}, standard_error={self.standard_error:.3g}, n_paths={self.n_paths})"
+
+class _SampleMoments:
+    """ Count, means and co-moments of the (payoff, control) samples, merged chunk by chunk (Chan et al.). """
+    def __init__(self, n=0, mean_y=0.0, mean_c=0.0, m2_yy=0.0, m2_cc=0.0, m2_yc=0.0):
+        self.n = n
+        self.mean_y = mean_y
+        self.mean_c = mean_c
+        self.m2_yy = m2_yy
+        self.m2_cc = m2_cc
+        self.m2_yc = m2_yc
+
+    @staticmethod
+    def from_samples(y, c):
+        dy = y - y.mean()
+        dc = c - c.mean()
+        return _SampleMoments(y.size, y.mean(), c.mean(), dy @ dy, dc @ dc, dy @ dc)
+
+    def merge(self, other):
+        n = self.n + other.n
+        delta_y = other.mean_y - self.mean_y
+        delta_c = other.mean_c - self.mean_c
+        weight = self.n*other.n/n
+
+        self.m2_yy += other.m2_yy + delta_y*delta_y*weight
+        self.m2_cc += other.m2_cc + delta_c*delta_c*weight
+        self.m2_yc += other.m2_yc + delta_y*delta_c*weight
+        self.mean_y += delta_y*other.n/n
+        self.mean_c += delta_c*other.n/n
+        self.n = n
+
+def _simulate_chunk(args):
+    """ Simulates one chunk of paths from its own seed, returns the moments of the discounted payoff and control. """
+    S, T, sigma, r, q, n_steps, n_paths, antithetic, control_variate_strike, payoff, seed = args
+    rng = np.random.default_rng(seed)
+
+    dt = T/n_steps
+    n_draws = n_paths//2 if antithetic else n_paths
+    z = rng.standard_normal((n_draws, n_steps))
+    if antithetic:
+        z = np.concatenate([z, -z])
+
+    log_returns = np.cumsum((r - q - 0.5*sigma**2)*dt + sigma*np.sqrt(dt)*z, axis=1)
+    paths = S*np.exp(log_returns)
+
+    discount = np.exp(-r*T)
+    y = discount*payoff(paths)
+    c = discount*np.maximum(paths[:, -1] - control_variate_strike, 0.0) if control_variate_strike is not None else np.zeros_like(y)
+
+    if antithetic:
+        # a pair (z, -z) is a single independent sample
+        y = 0.5*(y[:n_draws] + y[n_draws:])
+        c = 0.5*(c[:n_draws] + c[n_draws:])
+
+    return _SampleMoments.from_samples(y, c)
+
+class GBMMonteCarlo:
+    """
+    Monte Carlo pricing of European payoffs under geometric Brownian motion, with the same
+    inputs as BlackScholesVanillaCall (S, T, sigma and InterestRate r and q).
+
+    Paths are simulated in chunks of at most chunk_size paths so memory stays bounded
+    whatever the number of paths. Every chunk draws from its own stream spawned from
+    `seed`, so results do not depend on how the chunks are spread over the processes.
+    """
+    def __init__(self, *, S, T, sigma, r, q, n_steps=1):
+        assert_values_for_black_scholes(S=S, K=S, T=T, sigma=sigma, r=r, q=q)
+        assert isinstance(n_steps, int) and n_steps > 0, f"n_steps must be a positive int but got {n_steps}"
+
+        self.S = S
+        self.T = T
+        self.sigma = sigma
+        self.r = r
+        self.q = q
+        self.n_steps = n_steps
+
+    def iter_price(self, payoff, *, n_paths, chunk_size=2**16, antithetic=True, control_variate_strike=None, seed=None, processes=None):
+        """
+        Prices `payoff` and yields the running MonteCarloResult after every chunk.
+
+        Parameters
+        ----------
+        payoff : callable
+            Maps the simulated paths, array of shape (paths, n_steps) of the spot at each time
+            step, to the payoff at T of every path. Must be picklable when processes > 1.
+        n_paths : int
+            Total number of paths.
+        chunk_size : int
+            Number of paths simulated at once.
+        antithetic : bool
+            Simulates every draw z together with -z.
+        control_variate_strike : float or None
+            When given, the call with this strike is used as a control variate with its
+            BlackScholesVanillaCall price as the known mean.
+        seed : int or None
+            Seed of the random streams.
+        processes : int or None
+            Number of worker processes, None for all cores and 1 to run in this process.
+        """
+        assert n_paths > 0 and chunk_size > 0, "n_paths and chunk_size must be positive"
+        if antithetic:
+            chunk_size += chunk_size % 2
+            n_paths += n_paths % 2
+
+        chunks = [chunk_size]*(n_paths//chunk_size) + ([n_paths % chunk_size] if n_paths % chunk_size else [])
+        seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+        tasks = ((self.S, self.T, self.sigma, self.r.rate, self.q.rate, self.n_steps, n, antithetic, control_variate_strike, payoff, s)
+                 for n, s in zip(chunks, seeds))
+
+        control_price = None
+        if control_variate_strike is not None:
+            control_price = BlackScholesVanillaCall.option_price(S=self.S, K=control_variate_strike, T=self.T, sigma=self.sigma, r=self.r, q=self.q)
+
+        processes = os.cpu_count() if processes is None else processes
+        moments = _SampleMoments()
+        paths_done = 0
+        if processes == 1:
+            for chunk_paths, chunk_moments in zip(chunks, map(_simulate_chunk, tasks)):
+                moments.merge(chunk_moments)
+                paths_done += chunk_paths
+                yield self._result(moments, control_price, paths_done)
+        else:
+            # the process pool machinery is imported only when it is used
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                for chunk_paths, chunk_moments in zip(chunks, executor.map(_simulate_chunk, tasks)):
+                    moments.merge(chunk_moments)
+                    paths_done += chunk_paths
+                    yield self._result(moments, control_price, paths_done)
+
+    def price(self, payoff, **kwargs)->MonteCarloResult:
+        """ Runs iter_price to the end and returns the final MonteCarloResult. """
+        for result in self.iter_price(payoff, **kwargs):
+            pass
+        return result
+
+    @staticmethod
+    def _result(moments, control_price, n_paths):
+        n = moments.n
+        variance = moments.m2_yy/max(n - 1, 1)
+        price = moments.mean_y
+        if control_price is not None and moments.m2_cc > 0.0:
+            beta = moments.m2_yc/moments.m2_cc
+            price -= beta*(moments.mean_c - control_price)
+            variance = max(moments.m2_yy - beta*moments.m2_yc, 0.0)/max(n - 1, 1)
+        return MonteCarloResult(price=price, standard_error=np.sqrt(variance/n), n_paths=n_paths)
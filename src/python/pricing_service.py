@@ -0,0 +1,205 @@
+import asyncio
+import time
+
+import numpy as np
+
+from src.python.interest_rate import ZeroRateCurve
+from src.python.bond_portfolio import BondPortfolio
+from src.python.analytic_solutions.vanilla_call import BlackScholesVanillaCall, continuous_rate_array
+
+class Histogram:
+    """ Counts of observations in buckets with upper bounds `bounds` (plus one overflow bucket). """
+    def __init__(self, bounds):
+        self.bounds = np.asarray(bounds, dtype=np.float64)
+        self.counts = np.zeros(self.bounds.size + 1, dtype=np.int64)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[np.searchsorted(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """ Upper bound of the bucket holding the q-quantile (the max for the overflow bucket). """
+        if self.count == 0:
+            return np.nan
+        i = int(np.searchsorted(np.cumsum(self.counts), q*self.count))
+        return self.bounds[i] if i < self.bounds.size else self.max
+
+    def as_dict(self)->dict:
+        return dict(bounds=self.bounds.tolist(), counts=self.counts.tolist(), count=self.count,
+                    mean=self.sum/self.count if self.count else np.nan, max=self.max,
+                    p50=self.quantile(0.5), p99=self.quantile(0.99))
+
+# seconds, 10us to ~10s
+LATENCY_BOUNDS = 1e-5*2.0**np.arange(21)
+# instruments per batch
+BATCH_SIZE_BOUNDS = 2.0**np.arange(21)
+
+class _Request:
+    __slots__ = ('kind', 'key', 'payload', 'size', 'future', 'submitted')
+
+    def __init__(self, kind, key, payload, size, future):
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.size = size
+        self.future = future
+        self.submitted = time.perf_counter()
+
+class PricingService:
+    """
+    In-process asyncio front end that prices Bond and BlackScholesVanillaCall requests in
+    micro-batches.
+
+    Requests are queued and a single batcher task, woken by the first request, collects the
+    requests arriving in the next `window` seconds (up to `max_batch_size` instruments, the
+    rest wait for the next batch, a single larger request is priced on its own). Every group of the batch is then priced with one vectorized
+    call: bonds discounted against the same ZeroRateCurve go through a BondPortfolio and calls
+    through BlackScholesVanillaCall.price_and_greeks. Results are scattered back to the
+    awaiting callers. The queue holds at most `max_queue_size`
+    requests, callers wait for room when it is full (backpressure).
+
+    Usage:
+        async with PricingService(window=1e-3) as service:
+            prices = await service.price_bonds(bonds, zero_rates=curve)
+    """
+    def __init__(self, *, window=1e-3, max_batch_size=8192, max_queue_size=1024):
+        assert window >= 0.0, f"window must not be negative but got {window}"
+        assert max_batch_size > 0 and max_queue_size > 0, "max_batch_size and max_queue_size must be positive"
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+        self.queue = None
+        self.task = None
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        self.latency = {'bond': Histogram(LATENCY_BOUNDS), 'call': Histogram(LATENCY_BOUNDS)}
+        self.batch_size = {'bond': Histogram(BATCH_SIZE_BOUNDS), 'call': Histogram(BATCH_SIZE_BOUNDS)}
+        self.requests_per_batch = Histogram(BATCH_SIZE_BOUNDS)
+        self.backpressure_waits = 0
+
+    def metrics(self)->dict:
+        """ Latency (submit to result, seconds) and batch size histograms per instrument type, queue depth and backpressure waits. """
+        return dict(latency={kind: histogram.as_dict() for kind, histogram in self.latency.items()},
+                    batch_size={kind: histogram.as_dict() for kind, histogram in self.batch_size.items()},
+                    requests_per_batch=self.requests_per_batch.as_dict(),
+                    queue_depth=self.queue.qsize() if self.queue is not None else 0,
+                    backpressure_waits=self.backpressure_waits)
+
+    async def start(self):
+        assert self.task is None, "the service is already running"
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.task = asyncio.get_running_loop().create_task(self._batcher())
+        return self
+
+    async def stop(self):
+        """ Prices the requests already queued and stops the batcher. """
+        if self.task is None:
+            return
+        await self.queue.join()
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def price_bonds(self, bonds, *, zero_rates)->np.ndarray:
+        """ Prices of `bonds` against `zero_rates`, see Bond.get_bond_price_from_zero_rates. """
+        assert isinstance(zero_rates, ZeroRateCurve), "zero_rates must be a ZeroRateCurve"
+        bonds = list(bonds)
+        if not bonds:
+            return np.empty(0)
+        return await self._submit('bond', id(zero_rates), (zero_rates, bonds), len(bonds))
+
+    async def price_calls(self, *, S, K, T, sigma, r, q)->dict:
+        """ Price and greeks of European calls, see BlackScholesVanillaCall.price_and_greeks. """
+        S, K, T, sigma, r, q = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (S, K, T, sigma, continuous_rate_array(r), continuous_rate_array(q))))
+        return await self._submit('call', None, (S.shape, np.stack([S, K, T, sigma, r, q]).reshape(6, -1)), S.size)
+
+    async def _submit(self, kind, key, payload, size):
+        assert self.task is not None, "the service is not running, call start() first"
+        request = _Request(kind, key, payload, size, asyncio.get_running_loop().create_future())
+        if self.queue.full():
+            self.backpressure_waits += 1
+        await self.queue.put(request)
+        return await request.future
+
+    async def _batcher(self):
+        carried = None
+        while True:
+            if carried is None:
+                batch = [await self.queue.get()]
+                if self.window > 0.0:
+                    # let the requests sent meanwhile join this batch
+                    await asyncio.sleep(self.window)
+            else:
+                # the request that did not fit in the last batch waited long enough
+                batch, carried = [carried], None
+            size = batch[0].size
+            while size < self.max_batch_size and not self.queue.empty():
+                request = self.queue.get_nowait()
+                if size + request.size > self.max_batch_size:
+                    carried = request
+                    break
+                batch.append(request)
+                size += request.size
+
+            try:
+                self._price_batch(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _price_batch(self, batch):
+        self.requests_per_batch.observe(len(batch))
+        groups = {}
+        for request in batch:
+            if not request.future.cancelled():
+                groups.setdefault((request.kind, request.key), []).append(request)
+
+        for (kind, _), requests in groups.items():
+            self.batch_size[kind].observe(sum(request.size for request in requests))
+            try:
+                results = PricingService._price_group(kind, requests)
+            except Exception:
+                # price the requests one by one so a bad request only fails its own caller
+                results = []
+                for request in requests:
+                    try:
+                        results.append(PricingService._price_group(kind, [request])[0])
+                    except Exception as error:
+                        results.append(error)
+
+            done = time.perf_counter()
+            for request, result in zip(requests, results):
+                if isinstance(result, Exception):
+                    request.future.set_exception(result)
+                else:
+                    request.future.set_result(result)
+                self.latency[kind].observe(done - request.submitted)
+
+    @staticmethod
+    def _price_group(kind, requests)->list:
+        """ Prices the requests of one group with a single vectorized call and splits the results per request. """
+        splits = np.cumsum([request.size for request in requests])[:-1]
+        if kind == 'bond':
+            zero_rates = requests[0].payload[0]
+            portfolio = BondPortfolio([bond for request in requests for bond in request.payload[1]])
+            return np.split(portfolio.get_bond_prices_from_zero_rates(zero_rates=zero_rates), splits)
+
+        S, K, T, sigma, r, q = np.concatenate([request.payload[1] for request in requests], axis=1)
+        results = BlackScholesVanillaCall.price_and_greeks(S=S, K=K, T=T, sigma=sigma, r=r, q=q)
+        split = {name: np.split(values, splits) for name, values in results.items()}
+        return [{name: split[name][i].reshape(request.payload[0]) for name in split} for i, request in enumerate(requests)]
@@ -0,0 +1,66 @@
+import numpy as np
+
+from src.python.interest_rate import ZeroRateCurve
+from src.python.bond_portfolio import BondPortfolio
+from src.python.curve_interpolation import make_interpolator
+
+def key_rate_dv01(zero_rates, portfolio, *, bump=1e-4, method='bump')->np.ndarray:
+    """
+    Key rate DV01 of every bond with respect to every knot of the zero rate curve.
+
+    The curve is evaluated once over the union of the cashflow dates. For linear zero rate
+    and log-linear discount interpolation r(t)*t is linear in the knot rates, so a bump of a
+    knot rate is an exact multiplicative perturbation of the discount factors at the dates
+    it touches (at most two knots per date) and the whole matrix comes out of one pass over
+    the flows. Other schemes rebuild only the interpolation kernel once per bumped knot.
+
+    Parameters
+    ----------
+    zero_rates : ZeroRateCurve or sequence of ZeroRate
+    portfolio : BondPortfolio or sequence of Bond
+    bump : float
+        Size of the bump of the continuous zero rate at each knot, 1bp by default.
+    method : str
+        'bump' reprices exactly under each bumped curve, 'analytic' uses the first order
+        sensitivity bump*sum(t*dr(t)/dr_k*PV(flow)) and is only available for schemes with
+        r(t)*t linear in the knot rates (CurveInterpolator.rate_times_linear_in_rates).
+
+    Returns
+    -------
+    np.ndarray
+        Matrix of shape (number of bonds, number of knots) of price(base) - price(bumped),
+        positive for long positions when rates go up. Columns follow zero_rates.times.
+    """
+    assert method in ('bump', 'analytic'), f"method must be 'bump' or 'analytic' but got {method!r}"
+    if not isinstance(zero_rates, ZeroRateCurve):
+        zero_rates = ZeroRateCurve(zero_rates)
+    if not isinstance(portfolio, BondPortfolio):
+        portfolio = BondPortfolio(portfolio)
+
+    interpolator = zero_rates.interpolator
+    n_knots = interpolator.times.size
+    n_bonds = len(portfolio)
+    present_values = portfolio.discounted_amounts(zero_rates)
+
+    if not interpolator.rate_times_linear_in_rates:
+        assert method == 'bump', f"method='analytic' needs r(t)*t linear in the knot rates, not available for {type(interpolator).__name__}"
+        dv01 = np.empty((n_bonds, n_knots))
+        base = np.bincount(portfolio.owner, weights=present_values, minlength=n_bonds)
+        for k in range(n_knots):
+            bumped_rates = interpolator.rates.copy()
+            bumped_rates[k] += bump
+            bumped = make_interpolator(zero_rates.interpolation, interpolator.times, bumped_rates)
+            bumped_values = portfolio.amounts*bumped.discount_factors(portfolio.unique_times)[portfolio.time_index]
+            dv01[:, k] = base - np.bincount(portfolio.owner, weights=bumped_values, minlength=n_bonds)
+        return dv01
+
+    i0, w0, i1, w1 = interpolator.rate_time_weights(portfolio.unique_times)
+    dv01 = np.zeros(n_bonds*n_knots)
+    for knots, weights in ((i0, w0), (i1, w1)):
+        knots, weights = knots[portfolio.time_index], weights[portfolio.time_index]
+        if method == 'bump':
+            changes = present_values*-np.expm1(-bump*weights)
+        else:
+            changes = present_values*bump*weights
+        dv01 += np.bincount(portfolio.owner*n_knots + knots, weights=changes, minlength=n_bonds*n_knots)
+    return dv01.reshape(n_bonds, n_knots)
@@ -0,0 +1,197 @@
+import os
+from itertools import islice
+
+import numpy as np
+
+from src.python.interest_rate import ZeroRateCurve
+from src.python.bond_portfolio import BondPortfolio
+from src.python.curve_interpolation import make_interpolator
+from src.python.instrumentation import timed
+
+class ParallelShift:
+    """ Scenario i adds shifts[i] to the zero rate of every knot. """
+    def __init__(self, shifts):
+        self.shifts = np.asarray(shifts, dtype=np.float64).reshape(-1)
+
+    def __call__(self, base_rates, knot_times):
+        return base_rates + self.shifts[:, None]
+
+class Twist:
+    """ Scenario i adds slopes[i]*(t - pivot) to the zero rate of the knot at t, rotating the curve around `pivot`. """
+    def __init__(self, slopes, pivot):
+        self.slopes = np.asarray(slopes, dtype=np.float64).reshape(-1)
+        self.pivot = pivot
+
+    def __call__(self, base_rates, knot_times):
+        return base_rates + self.slopes[:, None]*(knot_times - self.pivot)
+
+class HistoricalReplay:
+    """ Scenario i adds the historical knot rate changes changes[i] to the base curve. """
+    def __init__(self, changes):
+        self.changes = np.atleast_2d(np.asarray(changes, dtype=np.float64))
+
+    @staticmethod
+    def from_history(rates, horizon=1):
+        """ Changes over `horizon` observations of a history of knot rates, array of shape (dates, knots). """
+        rates = np.asarray(rates, dtype=np.float64)
+        return HistoricalReplay(rates[horizon:] - rates[:-horizon])
+
+    def __call__(self, base_rates, knot_times):
+        assert self.changes.shape[1] == base_rates.size, f"expected changes for {base_rates.size} knots but got {self.changes.shape[1]}"
+        return base_rates + self.changes
+
+def _price_block(arrays, interpolation, start, stop):
+    """ PV of every bond under scenarios start..stop, array of shape (stop - start, bonds). """
+    rates = arrays['scenario_rates'][start:stop]
+    unique_times = arrays['unique_times']
+    if 'w0' in arrays:
+        # r(t)*t is linear in the knot rates, one expression for the whole block
+        rate_times = rates[:, arrays['i0']]*arrays['w0'] + rates[:, arrays['i1']]*arrays['w1']
+        discount_factors = np.exp(-rate_times)
+    else:
+        discount_factors = np.stack([make_interpolator(interpolation, arrays['knot_times'], scenario_rates).discount_factors(unique_times)
+                                     for scenario_rates in rates])
+
+    if 'cash_matrix' in arrays:
+        return discount_factors @ arrays['cash_matrix']
+    present_values = discount_factors[:, arrays['time_index']]*arrays['amounts']
+    return np.add.reduceat(present_values, arrays['offsets'][:-1], axis=1)
+
+_worker = {}
+
+def _attach(name, layout, interpolation):
+    """ Pool initializer, maps the shared arrays once per worker process. """
+    from multiprocessing.shared_memory import SharedMemory
+    shared_memory = SharedMemory(name=name)
+    _worker['shared_memory'] = shared_memory
+    _worker['arrays'] = {key: np.ndarray((length,), dtype=dtype, buffer=shared_memory.buf, offset=offset).reshape(shape)
+                         for key, (dtype, offset, length, shape) in layout.items()}
+    _worker['interpolation'] = interpolation
+
+def _price_shared_block(block):
+    start, stop = block
+    return start, stop, _price_block(_worker['arrays'], _worker['interpolation'], start, stop)
+
+class ScenarioEngine:
+    """
+    Prices a bond portfolio under many scenarios of a zero rate curve.
+
+    `scenarios` maps the continuous knot rates of the base curve and the knot times to the
+    knot rates of every scenario, array of shape (scenarios, knots), e.g. ParallelShift, Twist
+    or HistoricalReplay. Scenario curves keep the knot times and interpolation of the base curve.
+
+    The portfolio arrays and the scenario rates are put once in shared memory, the workers map
+    them when they start and a task is only the (start, stop) range of a block of scenarios.
+    For linear zero rate and log-linear discount interpolation r(t)*t is linear in the knot
+    rates (CurveInterpolator.rate_times_linear_in_rates), so a block of scenarios is priced without
+    building a curve per scenario. When the (dates, bonds) matrix of amounts has at most
+    `max_cash_matrix_size` elements a block is priced as one matrix product, otherwise the
+    discounted flows are summed per bond.
+    """
+    def __init__(self, *, zero_rates, portfolio, scenarios, block_size=None, max_cash_matrix_size=2**24):
+        if not isinstance(zero_rates, ZeroRateCurve):
+            zero_rates = ZeroRateCurve(zero_rates)
+        if not isinstance(portfolio, BondPortfolio):
+            portfolio = BondPortfolio(portfolio)
+        assert np.all(np.diff(portfolio.offsets) > 0), "every bond of the portfolio must have at least one flow"
+
+        self.zero_rates = zero_rates
+        self.portfolio = portfolio
+        interpolator = zero_rates.interpolator
+        self.scenario_rates = np.ascontiguousarray(scenarios(interpolator.rates, interpolator.times), dtype=np.float64)
+        assert self.scenario_rates.ndim == 2 and self.scenario_rates.shape[1] == interpolator.times.size, \
+            f"scenarios must give an array of shape (scenarios, {interpolator.times.size}) but got {self.scenario_rates.shape}"
+
+        n_bonds, n_times = len(portfolio), portfolio.unique_times.size
+        self.arrays = dict(scenario_rates=self.scenario_rates, knot_times=interpolator.times, unique_times=portfolio.unique_times)
+        if n_bonds*n_times <= max_cash_matrix_size:
+            # amount paid by every bond at every date, pricing a block is one matrix product
+            self.arrays['cash_matrix'] = np.bincount(portfolio.time_index*n_bonds + portfolio.owner, weights=portfolio.amounts,
+                                                     minlength=n_times*n_bonds).reshape(n_times, n_bonds)
+            row_size = n_bonds + n_times
+        else:
+            self.arrays.update(time_index=portfolio.time_index, amounts=portfolio.amounts, offsets=portfolio.offsets)
+            row_size = portfolio.times.size
+        # bound the intermediates of a block to ~32MB
+        self.block_size = block_size or max(1, 2**22//row_size)
+
+        if interpolator.rate_times_linear_in_rates:
+            i0, w0, i1, w1 = interpolator.rate_time_weights(portfolio.unique_times)
+            self.arrays.update(i0=i0, w0=w0, i1=i1, w1=w1)
+
+    def __len__(self):
+        return self.scenario_rates.shape[0]
+
+    @property
+    def shape(self):
+        """ Shape of the PV matrix, (scenarios, bonds). """
+        return len(self), len(self.portfolio)
+
+    def blocks(self, processes=1):
+        """ (start, stop) of the blocks of scenarios, at least a few blocks per process so the work is balanced. """
+        block_size = min(self.block_size, max(1, -(-len(self)//(4*processes)))) if processes > 1 else self.block_size
+        return [(start, min(start + block_size, len(self))) for start in range(0, len(self), block_size)]
+
+    def iter_blocks(self, *, processes=None):
+        """
+        Yields (start, stop, pvs) as soon as each block of scenarios is priced, pvs of shape
+        (stop - start, bonds). With several processes blocks come in completion order and at
+        most 2*processes blocks are submitted ahead of the consumer.
+
+        processes : int or None
+            Number of worker processes, None for all cores and 1 to run in this process.
+        """
+        processes = os.cpu_count() if processes is None else processes
+        interpolation = self.zero_rates.interpolation
+        if processes == 1:
+            for start, stop in self.blocks():
+                yield start, stop, _price_block(self.arrays, interpolation, start, stop)
+            return
+
+        # the process pool machinery is imported only when it is used
+        from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+        from multiprocessing.shared_memory import SharedMemory
+
+        layout, size = {}, 0
+        for key, array in self.arrays.items():
+            array = np.asarray(array)
+            layout[key] = (array.dtype, size, array.size, array.shape)
+            size += -(-array.nbytes//64)*64
+        shared_memory = SharedMemory(create=True, size=max(size, 1))
+        try:
+            for key, (dtype, offset, length, shape) in layout.items():
+                np.ndarray((length,), dtype=dtype, buffer=shared_memory.buf, offset=offset)[:] = np.asarray(self.arrays[key]).reshape(-1)
+
+            # at most 2*processes blocks in flight, so finished blocks are not held in memory
+            # and closing the generator early does not wait for the whole run
+            blocks = iter(self.blocks(processes))
+            pending = set()
+            with ProcessPoolExecutor(max_workers=processes, initializer=_attach, initargs=(shared_memory.name, layout, interpolation)) as executor:
+                try:
+                    while True:
+                        pending.update(executor.submit(_price_shared_block, block) for block in islice(blocks, 2*processes - len(pending)))
+                        if not pending:
+                            break
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                        done = None
+                finally:
+                    for future in pending:
+                        future.cancel()
+        finally:
+            shared_memory.close()
+            shared_memory.unlink()
+
+    @timed
+    def run(self, *, processes=None, out=None)->np.ndarray:
+        """
+        Returns the (scenarios, bonds) matrix of bond prices under every scenario. `out` may be
+        any array of that shape, e.g. an np.memmap for runs that do not fit in memory.
+        """
+        if out is None:
+            out = np.empty(self.shape)
+        assert out.shape == self.shape, f"out must have shape {self.shape} but got {out.shape}"
+        for start, stop, pvs in self.iter_blocks(processes=processes):
+            out[start:stop] = pvs
+        return out
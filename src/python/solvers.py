@@ -0,0 +1,90 @@
+import numpy as np
+
+from src.python.instrumentation import timed, count
+
+class NewtonResult:
+    """
+    Result of a vectorized root solve.
+
+    root : array of the roots, NaN where the solver did not converge.
+    iterations : number of iterations each element took.
+    converged : boolean mask of the elements that converged.
+    """
+    __slots__ = ('root', 'iterations', 'converged')
+
+    def __init__(self, root, iterations, converged):
+        self.root = root
+        self.iterations = iterations
+        self.converged = converged
+
+    @property
+    def non_converged(self):
+        """ Indices of the elements that did not converge. """
+        return np.flatnonzero(~self.converged)
+
+    def __repr__(self):
+        return f"NewtonResult(n={self.root.size}, converged={int(self.converged.sum())}, max_iterations={int(self.iterations.max(initial=0))})"
+
+@timed
+def solve_discounted_sums(*, times, amounts, owner, targets, x0, tol=1e-10, max_iter=50)->NewtonResult:
+    """
+    Solves sum_{k: owner[k]==i} amounts[k]*exp(-x[i]*times[k]) = targets[i] for every i.
+
+    Halley iterations with the analytic first and second derivatives of the discounted
+    sum (the duration and convexity sums). Every element carries its own convergence
+    flag and elements are dropped from the iteration once |step| < tol.
+
+    Parameters
+    ----------
+    times, amounts, owner : np.ndarray
+        Flat flow arrays, owner[k] is the index of the equation flow k belongs to.
+    targets : array_like
+        Right hand side of each equation.
+    x0 : array_like
+        Initial guess, broadcastable to targets.
+    tol : float or array_like
+        Absolute tolerance on the step, broadcastable to targets.
+    max_iter : int
+        Maximal number of iterations.
+
+    Returns
+    -------
+    NewtonResult
+    """
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1)
+    n = targets.size
+    x = np.array(np.broadcast_to(np.asarray(x0, dtype=np.float64), (n,)))
+    tol = np.broadcast_to(np.asarray(tol, dtype=np.float64), (n,))
+
+    iterations = np.zeros(n, dtype=np.int64)
+    converged = np.zeros(n, dtype=bool)
+    active = np.isfinite(targets) & np.isfinite(x)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+
+        flows = active[owner]
+        flow_owner = owner[flows]
+        flow_times = times[flows]
+        present_values = amounts[flows]*np.exp(-x[flow_owner]*flow_times)
+
+        f = np.bincount(flow_owner, weights=present_values, minlength=n) - targets
+        df = -np.bincount(flow_owner, weights=flow_times*present_values, minlength=n)
+        d2f = np.bincount(flow_owner, weights=flow_times**2*present_values, minlength=n)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = 2.0*f*df / (2.0*df**2 - f*d2f)
+
+        step = np.where(active, step, 0.0)
+        x -= step
+        iterations += active
+
+        done = active & (np.abs(step) < tol)
+        converged |= done
+        active &= ~done & np.isfinite(x)
+
+    count('solve_discounted_sums.iterations', int(iterations.max(initial=0)))
+    count('solve_discounted_sums.non_converged', int(n - converged.sum()))
+    root = np.where(converged, x, np.nan)
+    return NewtonResult(root=root, iterations=iterations, converged=converged)
@@ -0,0 +1,28 @@
+"""
+Standard normal distribution kernels. Importing scipy.special costs a few hundred milliseconds,
+so it is only imported on the first array call: single values go through libm and a process
+that never prices a batch never loads SciPy.
+"""
+import math
+
+import numpy as np
+
+SQRT_2PI = np.sqrt(2.0*np.pi)
+
+def norm_pdf(x):
+    x = np.asarray(x, dtype=np.float64)
+    return (np.exp(-0.5*x*x)/SQRT_2PI)[()]
+
+def norm_cdf(x):
+    """ Standard normal CDF, scipy.special.ndtr for arrays and math.erfc for a single value. """
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 0:
+        # a single value is far cheaper through libm than through a ufunc
+        return np.float64(0.5*math.erfc(-float(x)/math.sqrt(2.0)))
+    from scipy.special import ndtr
+    return ndtr(x)
+
+def norm_ppf(p):
+    """ Inverse of the standard normal CDF (scipy.special.ndtri), -inf/inf at 0/1 and NaN outside of [0, 1]. """
+    from scipy.special import ndtri
+    return ndtri(np.asarray(p, dtype=np.float64))[()]
@@ -0,0 +1,200 @@
+import os
+import numpy as np
+
+from src.python.cashflow import CashFlow
+from src.python.interest_rate import InterestRate, ZeroRateCurve
+from src.python.bond import Bond
+from src.python.bond_portfolio import BondPortfolio
+
+FORMAT_VERSION = 1
+MAGIC = b'PBFSTORE'
+ALIGNMENT = 64
+MAX_COLUMNS = 16
+
+FILE_HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('reserved', 'V52')])
+RECORD_HEADER = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u4'),
+    ('kind', 'S16'),
+    ('name', 'S128'),
+    ('meta', 'S64'),
+    ('n_columns', '<u4'),
+    ('column_names', 'S24', (MAX_COLUMNS,)),
+    ('column_dtypes', 'S4', (MAX_COLUMNS,)),
+    ('column_lengths', '<u8', (MAX_COLUMNS,)),
+    ('record_bytes', '<u8'),
+])
+RECORD_MAGIC = b'REC1'
+DTYPES = {'<f8': np.float64, '<i8': np.int64}
+
+PORTFOLIO_COLUMNS = ('offsets', 'times', 'amounts', 'owner', 'principals', 'coupon_rates', 'coupon_frequencies',
+                     'times_to_maturity', 'unique_times', 'time_index')
+
+def _aligned(n_bytes):
+    return -(-n_bytes // ALIGNMENT)*ALIGNMENT
+
+class Record:
+    """ Location of one record of a MarketDataStore: kind, name, meta and (dtype, byte offset, length) per column. """
+    __slots__ = ('kind', 'name', 'meta', 'columns', 'offset', 'version')
+
+    def __init__(self, kind, name, meta, columns, offset, version):
+        self.kind = kind
+        self.name = name
+        self.meta = meta
+        self.columns = columns
+        self.offset = offset
+        self.version = version
+
+    def __repr__(self):
+        return f"Record(kind={self.kind!r}, name={self.name!r}, meta={self.meta!r}, columns={list(self.columns)})"
+
+class MarketDataStore:
+    """
+    Append only binary store of curves, cashflow schedules and bond portfolios in a single file.
+
+    The file starts with a versioned header followed by records. Every record has a fixed size
+    header (kind, name, meta and the dtype and length of each column) and its columns stored one
+    after the other, each aligned to 64 bytes. Loading memory maps the file read only with
+    np.memmap, so the arrays handed out are views of the OS page cache: nothing is parsed or
+    copied and processes opening the same file share the pages.
+
+    Records are never rewritten, a new snapshot (e.g. the curves of the day) is appended at the
+    end. Several records may have the same name, load_* return the last one appended.
+    """
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.records = []
+        self._map = None
+        self._end = FILE_HEADER.itemsize
+
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            header = np.zeros((), dtype=FILE_HEADER)
+            header['magic'] = MAGIC
+            header['version'] = FORMAT_VERSION
+            with open(self.path, 'wb') as f:
+                f.write(header.tobytes())
+        self.refresh()
+
+    def refresh(self):
+        """ Picks up the records appended since the last refresh (by this or another process). """
+        size = os.path.getsize(self.path)
+        with open(self.path, 'rb') as f:
+            if not self.records:
+                header = np.frombuffer(f.read(FILE_HEADER.itemsize), dtype=FILE_HEADER)[0]
+                assert header['magic'] == MAGIC, f"{self.path} is not a market data store"
+                assert header['version'] <= FORMAT_VERSION, f"{self.path} has format version {header['version']}, newer than the supported {FORMAT_VERSION}"
+
+            while self._end + RECORD_HEADER.itemsize <= size:
+                f.seek(self._end)
+                header = np.frombuffer(f.read(RECORD_HEADER.itemsize), dtype=RECORD_HEADER)[0]
+                assert header['magic'] == RECORD_MAGIC, f"corrupted record header at byte {self._end} of {self.path}"
+                assert header['version'] <= FORMAT_VERSION, f"record at byte {self._end} has format version {header['version']}, newer than the supported {FORMAT_VERSION}"
+                if self._end + header['record_bytes'] > size:
+                    # a record still being written by another process
+                    break
+                self.records.append(MarketDataStore._record(header, self._end))
+                self._end += int(header['record_bytes'])
+
+        if self._map is None or self._map.size < self._end:
+            self._map = np.memmap(self.path, dtype=np.uint8, mode='r', shape=(self._end,))
+        return self
+
+    @staticmethod
+    def _record(header, offset):
+        columns = {}
+        position = offset + _aligned(RECORD_HEADER.itemsize)
+        for i in range(int(header['n_columns'])):
+            dtype = np.dtype(header['column_dtypes'][i].decode())
+            length = int(header['column_lengths'][i])
+            columns[header['column_names'][i].decode()] = (dtype, position, length)
+            position += _aligned(length*dtype.itemsize)
+        return Record(header['kind'].decode(), header['name'].decode(), header['meta'].decode(), columns, offset, int(header['version']))
+
+    def _append(self, kind, name, columns, meta=''):
+        """ Writes one record at the end of the file, `columns` maps column names to 1d arrays. """
+        assert len(columns) <= MAX_COLUMNS, f"a record has at most {MAX_COLUMNS} columns"
+        columns = {column: np.ascontiguousarray(values) for column, values in columns.items()}
+        for column, values in columns.items():
+            assert values.ndim == 1 and values.dtype.str in DTYPES, f"column {column!r} must be a 1d float64 or int64 array but got {values.dtype} with shape {values.shape}"
+
+        header = np.zeros((), dtype=RECORD_HEADER)
+        header['magic'] = RECORD_MAGIC
+        header['version'] = FORMAT_VERSION
+        header['kind'] = kind.encode()
+        header['name'] = name.encode()
+        header['meta'] = meta.encode()
+        header['n_columns'] = len(columns)
+        for i, (column, values) in enumerate(columns.items()):
+            header['column_names'][i] = column.encode()
+            header['column_dtypes'][i] = values.dtype.str.encode()
+            header['column_lengths'][i] = values.size
+        header['record_bytes'] = _aligned(RECORD_HEADER.itemsize) + sum(_aligned(values.nbytes) for values in columns.values())
+        assert len(name.encode()) <= RECORD_HEADER['name'].itemsize, f"record name is limited to {RECORD_HEADER['name'].itemsize} bytes"
+
+        self.refresh()
+        with open(self.path, 'r+b') as f:
+            f.seek(0, os.SEEK_END)
+            start = f.tell()
+            assert start == self._end, f"{self.path} has a partially written record at byte {self._end}"
+            f.write(header.tobytes().ljust(_aligned(RECORD_HEADER.itemsize), b'\0'))
+            for values in columns.values():
+                f.write(values.tobytes().ljust(_aligned(values.nbytes), b'\0'))
+        return self.refresh().records[-1]
+
+    def append_curve(self, name, curve: ZeroRateCurve):
+        """ Stores the knot times and continuous knot rates of `curve`, the interpolation must be a named one. """
+        assert isinstance(curve.interpolation, str), "only curves with a named interpolation can be stored"
+        return self._append('curve', name, dict(times=np.asarray(curve.times, dtype=np.float64),
+                                                rates=np.asarray(curve.continuous_rates, dtype=np.float64)), meta=curve.interpolation)
+
+    def append_cashflows(self, name, cashflows):
+        """ Stores a CashFlow or a sequence of CashFlow as one ragged record. """
+        if isinstance(cashflows, CashFlow):
+            cashflows = [cashflows]
+        lengths = np.array([len(cashflow) for cashflow in cashflows], dtype=np.int64)
+        return self._append('cashflows', name, dict(offsets=np.concatenate([[0], np.cumsum(lengths)]),
+                                                    times=np.concatenate([cashflow.times for cashflow in cashflows]),
+                                                    amounts=np.concatenate([cashflow.amounts for cashflow in cashflows])))
+
+    def append_bonds(self, name, bonds):
+        """ Stores the definitions and the stacked cashflows of a BondPortfolio or a sequence of Bond. """
+        portfolio = bonds if isinstance(bonds, BondPortfolio) else BondPortfolio(bonds)
+        return self._append('bonds', name, {column: getattr(portfolio, column) for column in PORTFOLIO_COLUMNS})
+
+    def names(self, kind=None):
+        """ Names of the stored records (of `kind` if given) in the order they were first appended. """
+        return list(dict.fromkeys(record.name for record in self.records if kind is None or record.kind == kind))
+
+    def find(self, kind, name)->Record:
+        """ The last record of `kind` named `name`. """
+        for record in reversed(self.records):
+            if record.kind == kind and record.name == name:
+                return record
+        raise KeyError(f"no {kind} named {name!r} in {self.path}")
+
+    def columns(self, record: Record)->dict:
+        """ The columns of `record` as read only arrays backed by the memory map. """
+        return {column: self._map[offset:offset + length*dtype.itemsize].view(dtype)
+                for column, (dtype, offset, length) in record.columns.items()}
+
+    def load_curve(self, name, interpolation=None)->ZeroRateCurve:
+        record = self.find('curve', name)
+        columns = self.columns(record)
+        return ZeroRateCurve.from_arrays(columns['times'], columns['rates'], interpolation=interpolation or record.meta)
+
+    def load_cashflows(self, name)->list:
+        columns = self.columns(self.find('cashflows', name))
+        offsets, times, amounts = columns['offsets'], columns['times'], columns['amounts']
+        return [CashFlow(times=times[start:end], amounts=amounts[start:end]) for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def load_portfolio(self, name)->BondPortfolio:
+        """ The stored bonds as a BondPortfolio whose arrays are the memory mapped columns. """
+        return BondPortfolio.from_arrays(**self.columns(self.find('bonds', name)))
+
+    def load_bonds(self, name)->list:
+        """ The stored bonds as Bond objects (their cashflows are rebuilt from the definitions). """
+        columns = self.columns(self.find('bonds', name))
+        return [Bond(principal=float(principal), interest_rate=InterestRate(float(rate), 'continuous'),
+                     coupon_frequency=int(frequency), time_to_maturity=float(maturity))
+                for principal, rate, frequency, maturity in zip(columns['principals'], columns['coupon_rates'],
+                                                                  columns['coupon_frequencies'], columns['times_to_maturity'])]
@@ -1,6 +1,7 @@
 import sys
 sys.path.append('..')
 import numpy as np
+import pytest
 from src.python.analytic_solutions.vanilla_call import BlackScholesVanillaCall
 from src.python.interest_rate import InterestRate, ForwardRate, ZeroRate
 from src.python.analytic_solutions.simple_formulas import ForwardRateAgreement
@@ -83,4 +84,83 @@ def test_forward_rate_agreement():
     t2 = zero_rates_pq_4_4[4].time
     forward_rate = ForwardRate.calculate_forward_rate_from_zero_rates(zero_rates_pq_4_4, t1, t2, compounding_frequency=4)
 
-    assert np.allclose(fra_pq_4_5.price(forward_rate, compounding_frequency=4), 1195.0, atol=1)
\ No newline at end of file
+    assert np.allclose(fra_pq_4_5.price(forward_rate, compounding_frequency=4), 1195.0, atol=1)
+
+def test_vanilla_call_price_and_greeks_batch():
+    r = InterestRate(0.05, 'continuous')
+    q = InterestRate(0.02, 'continuous')
+    S = np.array([80., 100., 120., 930.])
+    K = np.array([100., 100., 100., 900.])
+    T = np.array([0.5, 1.0, 2.0, 2./12.])
+    sigma = np.array([0.3, 0.2, 0.25, 0.2])
+
+    batch = BlackScholesVanillaCall.price_and_greeks(S=S, K=K, T=T, sigma=sigma, r=r, q=q)
+
+    for i in range(len(S)):
+        option_data = dict(S=S[i], K=K[i], T=T[i], sigma=sigma[i], r=r, q=q)
+        assert np.isclose(batch['price'][i], BlackScholesVanillaCall.option_price(**option_data), atol=1e-10)
+        assert np.isclose(batch['delta'][i], BlackScholesVanillaCall.delta(**option_data), atol=1e-12)
+        assert np.isclose(batch['d_plus'][i], BlackScholesVanillaCall.d_plus(**option_data), atol=1e-12)
+        assert np.isclose(batch['d_minus'][i], BlackScholesVanillaCall.d_minus(**option_data), atol=1e-12)
+
+    # greeks against central finite differences
+    price = lambda **kw: BlackScholesVanillaCall.price_and_greeks(**{**dict(S=S, K=K, T=T, sigma=sigma, r=r.rate, q=q.rate), **kw})['price']
+    h = 1e-4
+    assert np.allclose(batch['delta'], (price(S=S+h) - price(S=S-h))/(2*h), atol=1e-6)
+    assert np.allclose(batch['gamma'], (price(S=S+h) - 2*price() + price(S=S-h))/h**2, atol=1e-4)
+    assert np.allclose(batch['vega'], (price(sigma=sigma+h) - price(sigma=sigma-h))/(2*h), atol=1e-5)
+    assert np.allclose(batch['rho'], (price(r=r.rate+h) - price(r=r.rate-h))/(2*h), atol=1e-5)
+    assert np.allclose(batch['theta'], -(price(T=T+h) - price(T=T-h))/(2*h), atol=1e-5)
+
+    # broadcasting a strike ladder against a single underlying, rates as arrays
+    ladder = BlackScholesVanillaCall.price_and_greeks(S=100., K=np.linspace(80., 120., 5), T=1., sigma=0.2, r=np.full(5, 0.05), q=0.0)
+    assert ladder['price'].shape == (5,)
+    assert np.isclose(ladder['price'][2], 10.45058, atol=1e-5)
+    assert np.all(np.diff(ladder['price']) < 0.0)
+
+    with pytest.raises(AssertionError):
+        BlackScholesVanillaCall.price_and_greeks(S=S, K=K, T=np.array([1.0, 0.0, 1.0, 1.0]), sigma=sigma, r=r, q=q)
+
+def test_vanilla_call_implied_volatility():
+    rng = np.random.default_rng(42)
+    n = 2000
+    S = rng.uniform(50., 150., n)
+    K = rng.uniform(40., 200., n)
+    T = rng.uniform(0.05, 5.0, n)
+    sigma = rng.uniform(0.05, 1.5, n)
+    r = rng.uniform(0.0, 0.08, n)
+    q = rng.uniform(0.0, 0.05, n)
+
+    price = BlackScholesVanillaCall.price_and_greeks(S=S, K=K, T=T, sigma=sigma, r=r, q=q)['price']
+    # vega is too small to recover sigma from a price with double precision
+    identifiable = BlackScholesVanillaCall.price_and_greeks(S=S, K=K, T=T, sigma=sigma, r=r, q=q)['vega'] > 1e-6
+
+    result = BlackScholesVanillaCall.implied_volatility(price=price, S=S, K=K, T=T, r=r, q=q)
+
+    assert result.converged[identifiable].all()
+    assert np.allclose(result.root[identifiable], sigma[identifiable], atol=1e-7)
+
+    # page 392 and the web calculator
+    option_data_p392 = dict(S=930., K=900., T=2./12., r=InterestRate(0.08, "continuous"), q=InterestRate(0.03, 'continuous'))
+    price_p392 = BlackScholesVanillaCall.option_price(sigma=0.2, **option_data_p392)
+    assert np.isclose(BlackScholesVanillaCall.implied_volatility(price=price_p392, **option_data_p392).root, 0.2, atol=1e-10)
+    web = dict(S=100., K=100., T=1., r=InterestRate(0.05, "continuous"), q=InterestRate(0.0, 'continuous'))
+    assert np.isclose(BlackScholesVanillaCall.implied_volatility(price=10.45058, **web).root, 0.2, atol=1e-5)
+
+    # arbitrage violating quotes: below intrinsic value, above the spot, at zero
+    quotes = np.array([10.45058, 4.0, 100.5, 0.0])
+    result = BlackScholesVanillaCall.implied_volatility(price=quotes, **web)
+    assert np.array_equal(result.non_converged, [1, 2, 3])
+    assert np.all(np.isnan(result.root[1:]))
+
+def test_vanilla_call_strike_given_delta_batch():
+    r = InterestRate(0.05, 'continuous')
+    q = InterestRate(0.02, 'continuous')
+    K = np.array([70., 90., 100., 110., 150.])
+    delta = BlackScholesVanillaCall.price_and_greeks(S=100., K=K, T=0.75, sigma=0.25, r=r, q=q)['delta']
+
+    strikes = BlackScholesVanillaCall.strike_given_delta(delta=delta, S=100., T=0.75, sigma=0.25, r=r, q=q)
+    assert np.allclose(strikes, K, atol=1e-8)
+
+    out_of_range = BlackScholesVanillaCall.strike_given_delta(delta=np.array([0.0, 0.999]), S=100., T=0.75, sigma=0.25, r=r, q=q)
+    assert np.all(np.isnan(out_of_range))
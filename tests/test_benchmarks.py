@@ -0,0 +1,50 @@
+import sys
+sys.path.append('..')
+import json
+from benchmarks import suite
+from benchmarks.harness import BENCHMARKS, run_benchmark, profile_benchmark, append_history, load_history, find_baseline, compare
+from benchmarks.run import main
+
+def test_every_benchmark_runs():
+    assert {'bond_price_from_zero_rates', 'bond_yield', 'forward_rate_from_zero_rates', 'vanilla_call_option_price'} <= set(BENCHMARKS)
+    for benchmark in BENCHMARKS.values():
+        assert set(benchmark.sizes) == {'small', 'medium', 'large'}
+
+    result = run_benchmark(BENCHMARKS['bond_portfolio_prices'], 'small', repeat=1)
+    assert result['size'] == 1_000 and result['parameter'] == 'n_bonds'
+    assert result['seconds'] > 0.0 and result['throughput'] > 0.0 and result['peak_memory_bytes'] > 0
+
+    report = profile_benchmark(BENCHMARKS['bond_portfolio_prices'], 'small')
+    assert 'get_bond_prices_from_zero_rates' in report
+
+def test_history_and_regressions(tmp_path):
+    path = str(tmp_path/'history.json')
+    result = dict(name='toy', preset='small', parameter='n', size=10, seconds=1.0, throughput=10.0, peak_memory_bytes=0)
+    append_history(path, [result], commit='aaaaaaa')
+    append_history(path, [dict(result, seconds=2.0)], commit='bbbbbbb')
+
+    history = load_history(path)
+    assert [entry['commit'] for entry in history] == ['aaaaaaa', 'bbbbbbb']
+    assert find_baseline(history)['commit'] == 'bbbbbbb'
+    assert find_baseline(history, 'aaaaaaa')['results'][0]['seconds'] == 1.0
+
+    assert compare([dict(result, seconds=1.2)], find_baseline(history, 'aaaaaaa'), threshold=0.25) == []
+    regressions = compare([dict(result, seconds=1.3)], find_baseline(history, 'aaaaaaa'), threshold=0.25)
+    assert len(regressions) == 1 and abs(regressions[0][2] - 0.3) < 1e-12
+    # a different problem size is not comparable
+    assert compare([dict(result, size=20, seconds=5.0)], find_baseline(history), threshold=0.25) == []
+
+def test_run_fails_on_regression(tmp_path):
+    path = str(tmp_path/'history.json')
+    assert main(['--filter', 'bond_portfolio_prices', '--repeat', '1', '--history', path]) == 0
+
+    history = load_history(path)
+    history[-1]['results'][0]['seconds'] /= 100.0
+    with open(path, 'w') as file:
+        json.dump(history, file)
+    assert main(['--filter', 'bond_portfolio_prices', '--repeat', '1', '--history', path, '--no-save']) == 1
+    assert len(load_history(path)) == 1
+
+    # an unknown baseline commit fails instead of skipping the comparison
+    assert main(['--filter', 'bond_portfolio_prices', '--repeat', '1', '--history', path, '--baseline', 'deadbeef']) == 2
+    assert len(load_history(path)) == 1
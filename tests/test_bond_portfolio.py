@@ -0,0 +1,78 @@
+import sys
+sys.path.append('..')
+import numpy as np
+from src.python.interest_rate import InterestRate, ZeroRate, ZeroRateCurve
+from src.python.bond import Bond
+from src.python.bond_portfolio import BondPortfolio
+
+zero_rates_table_42 = np.array([ZeroRate(0.5, 0.050, 'continuous'),
+                                ZeroRate(1.0, 0.058, 'continuous'),
+                                ZeroRate(1.5, 0.064, 'continuous'),
+                                ZeroRate(2.0, 0.068, 'continuous')])
+
+def make_bonds():
+    return [
+        Bond(principal=100.0, interest_rate=InterestRate(0.06, 1), coupon_frequency=2, time_to_maturity=2.0),
+        Bond(principal=100.0, interest_rate=InterestRate(0.04, 1), coupon_frequency=2, time_to_maturity=1.5),
+        Bond(principal=50.0, interest_rate=InterestRate(0.08, 1), coupon_frequency=4, time_to_maturity=3.0),
+        Bond(principal=100.0, interest_rate=InterestRate(0.0, 1), coupon_frequency=0, time_to_maturity=1.25),
+    ]
+
+def test_bond_portfolio_layout():
+    bonds = make_bonds()
+    portfolio = BondPortfolio(bonds)
+
+    assert len(portfolio) == 4
+    for i, bond in enumerate(bonds):
+        assert np.array_equal(portfolio.times[portfolio.offsets[i]:portfolio.offsets[i+1]], bond.cashflow.times)
+        assert np.array_equal(portfolio.amounts[portfolio.offsets[i]:portfolio.offsets[i+1]], bond.cashflow.amounts)
+    assert np.array_equal(portfolio.unique_times[portfolio.time_index], portfolio.times)
+
+def test_bond_portfolio_prices():
+    bonds = make_bonds()
+    portfolio = BondPortfolio(bonds)
+    curve = ZeroRateCurve(zero_rates_table_42)
+
+    prices = portfolio.get_bond_prices_from_zero_rates(zero_rates=curve)
+    expected = [bond.get_bond_price_from_zero_rates(zero_rates=curve) for bond in bonds]
+
+    assert np.allclose(prices, expected, rtol=1e-12)
+    assert np.isclose(prices[0], 98.39, atol=1e-2)
+    assert np.allclose(portfolio.get_bond_prices_from_zero_rates(zero_rates=zero_rates_table_42), prices, rtol=1e-12)
+
+def test_bond_portfolio_yields():
+    bonds = make_bonds() + [Bond(principal=100.0, interest_rate=InterestRate(0.08, 1), coupon_frequency=2, time_to_maturity=3.0)]
+    portfolio = BondPortfolio(bonds)
+    yields = np.array([0.052, 0.06, 0.03, 0.045, 0.0])
+    prices = np.array([bond.get_bond_price_from_yield(bond_yield=InterestRate(y, 'continuous')) for bond, y in zip(bonds, yields)])
+    prices[-1] = 104.0
+
+    result = portfolio.calculate_bond_yields(bond_prices=prices)
+
+    assert result.converged.all() and len(result.non_converged) == 0
+    assert np.allclose(result.root[:-1], yields[:-1], atol=1e-10)
+    # pq 4.11
+    assert np.isclose(result.root[-1], 0.06407, atol=1e-5)
+    assert np.isclose(result.root[-1], bonds[-1].calculate_bond_yield(bond_price=104.0).rate, atol=1e-8)
+    assert result.iterations.max() < 10
+
+    prices[1] = -1.0
+    prices[2] = np.nan
+    result = portfolio.calculate_bond_yields(bond_prices=prices)
+    assert np.array_equal(result.non_converged, [1, 2])
+    assert np.isnan(result.root[1]) and np.isnan(result.root[2])
+    assert np.allclose(result.root[[0, 3]], yields[[0, 3]], atol=1e-10)
+
+def test_bond_portfolio_zero_rates_from_bond_prices():
+    zero_rates_pq_42 = np.array([ZeroRate(0.5, 0.05, 1), ZeroRate(1.0, 0.05, 1)])
+    bonds = [Bond(principal=100.0, interest_rate=InterestRate(0.04, 1), coupon_frequency=2, time_to_maturity=1.5),
+             Bond(principal=100.0, interest_rate=InterestRate(0.07, 1), coupon_frequency=2, time_to_maturity=2.0)]
+    prices = np.array([bonds[0].get_bond_price_from_yield(bond_yield=InterestRate(0.052, 2)), 101.0])
+
+    result = BondPortfolio(bonds).calculate_zero_rates_at_time_of_maturity_from_bond_prices(bond_prices=prices, zero_rates=zero_rates_pq_42)
+
+    assert result.converged.all()
+    for bond, price, rate in zip(bonds, prices, result.root):
+        expected = bond.calculate_zero_rate_at_time_of_maturity_from_bond_price(bond_price=price, zero_rates=zero_rates_pq_42)
+        assert np.isclose(rate, expected.rate, atol=1e-6)
+    assert np.isclose(InterestRate(result.root[0], 'continuous')(2), 0.052, atol=1e-4)
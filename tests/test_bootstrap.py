@@ -0,0 +1,61 @@
+import sys
+sys.path.append('..')
+import numpy as np
+from src.python.interest_rate import InterestRate, ZeroRate, ZeroRateCurve
+from src.python.bond import Bond
+from src.python.bond_portfolio import BondPortfolio
+from src.python.bootstrap import ZeroCurveBootstrapper
+
+def test_bootstrap_table_4_3():
+    # table 4.3, zero coupon bonds up to a year and semi annual coupon bonds after
+    bonds = [
+        Bond(principal=100.0, interest_rate=InterestRate(0.0, 1), coupon_frequency=0, time_to_maturity=0.25),
+        Bond(principal=100.0, interest_rate=InterestRate(0.0, 1), coupon_frequency=0, time_to_maturity=0.5),
+        Bond(principal=100.0, interest_rate=InterestRate(0.0, 1), coupon_frequency=0, time_to_maturity=1.0),
+        Bond(principal=100.0, interest_rate=InterestRate(0.08, 1), coupon_frequency=2, time_to_maturity=1.5),
+        Bond(principal=100.0, interest_rate=InterestRate(0.12, 1), coupon_frequency=2, time_to_maturity=2.0),
+    ]
+    prices = np.array([97.5, 94.9, 90.0, 96.0, 101.6])
+
+    bootstrapper = ZeroCurveBootstrapper(bonds=bonds, bond_prices=prices)
+
+    assert np.allclose(bootstrapper.zero_rates, [0.10127, 0.10469, 0.10536, 0.10681, 0.10808], atol=1e-5)
+    assert np.allclose(bootstrapper.discount_factors[:3]*100.0, prices[:3], atol=1e-10)
+
+    curve = bootstrapper.curve
+    assert isinstance(curve, ZeroRateCurve)
+    assert np.allclose([bond.get_bond_price_from_zero_rates(zero_rates=curve) for bond in bonds], prices, atol=1e-9)
+
+def test_bootstrap_matches_single_point():
+    zero_rates_pq_42 = [ZeroRate(0.5, 0.05, 1), ZeroRate(1.0, 0.05, 1)]
+    bonds = [Bond(principal=100.0, interest_rate=InterestRate(0.0, 1), coupon_frequency=0, time_to_maturity=0.5),
+             Bond(principal=100.0, interest_rate=InterestRate(0.0, 1), coupon_frequency=0, time_to_maturity=1.0),
+             Bond(principal=100.0, interest_rate=InterestRate(0.04, 1), coupon_frequency=2, time_to_maturity=1.5)]
+    prices = [bond.get_bond_price_from_zero_rates(zero_rates=zero_rates_pq_42) for bond in bonds[:2]]
+    prices.append(bonds[2].get_bond_price_from_yield(bond_yield=InterestRate(0.052, 2)))
+
+    bootstrapper = ZeroCurveBootstrapper(bonds=bonds, bond_prices=prices)
+    expected = bonds[2].calculate_zero_rate_at_time_of_maturity_from_bond_price(bond_price=prices[2], zero_rates=zero_rates_pq_42)
+
+    assert np.allclose(bootstrapper.zero_rates[:2], [r.rate for r in zero_rates_pq_42], atol=1e-12)
+    assert np.isclose(bootstrapper.zero_rates[2], expected.rate, atol=1e-6)
+
+def test_bootstrap_update_prices():
+    rng = np.random.default_rng(1)
+    maturities = np.arange(1, 41)*0.5
+    bonds = [Bond(principal=100.0, interest_rate=InterestRate(c, 1), coupon_frequency=2, time_to_maturity=T)
+             for c, T in zip(rng.uniform(0.02, 0.06, maturities.size), maturities)]
+    true_curve = ZeroRateCurve([ZeroRate(T, 0.03 + 0.01*np.sqrt(T), 'continuous') for T in maturities])
+    prices = BondPortfolio(bonds).get_bond_prices_from_zero_rates(zero_rates=true_curve)
+
+    bootstrapper = ZeroCurveBootstrapper(bonds=bonds, bond_prices=prices)
+    assert np.allclose(bootstrapper.zero_rates, true_curve.continuous_rates, atol=1e-10)
+
+    prices[25] += 0.1
+    head = bootstrapper.zero_rates[:25].copy()
+    bootstrapper.update_prices({25: prices[25]})
+
+    assert np.array_equal(bootstrapper.zero_rates[:25], head)
+    fresh = ZeroCurveBootstrapper(bonds=bonds, bond_prices=prices)
+    assert np.allclose(bootstrapper.zero_rates, fresh.zero_rates, atol=1e-12)
+    assert np.allclose(BondPortfolio(bonds).get_bond_prices_from_zero_rates(zero_rates=bootstrapper.curve), prices, atol=1e-9)
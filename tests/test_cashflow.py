@@ -0,0 +1,44 @@
+import sys
+sys.path.append('..')
+import numpy as np
+from src.python.cashflow import CashFlow
+from src.python.interest_rate import InterestRate, ZeroRate, ZeroRateCurve
+
+def test_cashflow_arrays():
+    cashflow = CashFlow(times=[0.5, 1.0, 1.5], amounts=[2.0, 2.0, 102.0])
+
+    assert cashflow.times.dtype == np.float64 and cashflow.times.flags.c_contiguous
+    assert cashflow.amounts.dtype == np.float64 and cashflow.amounts.flags.c_contiguous
+    assert len(cashflow) == 3
+    assert list(cashflow) == [(0.5, 2.0), (1.0, 2.0), (1.5, 102.0)]
+    assert not hasattr(cashflow, '__dict__')
+
+def test_cashflow_operations():
+    coupons = CashFlow(times=[0.5, 1.0, 1.5, 2.0], amounts=[3.0, 3.0, 3.0, 3.0])
+    principal = CashFlow(times=[2.0], amounts=[100.0])
+
+    merged = coupons.merge(principal)
+    assert np.array_equal(merged.times, [0.5, 1.0, 1.5, 2.0])
+    assert np.array_equal(merged.amounts, [3.0, 3.0, 3.0, 103.0])
+
+    concatenated = CashFlow.concatenate(coupons, principal)
+    assert np.array_equal(concatenated.times, [0.5, 1.0, 1.5, 2.0, 2.0])
+    assert np.array_equal(concatenated.amounts, [3.0, 3.0, 3.0, 3.0, 100.0])
+
+    assert np.array_equal(coupons.scale(2.0).amounts, [6.0, 6.0, 6.0, 6.0])
+    assert np.array_equal(coupons.scale(2.0).times, coupons.times)
+
+    window = concatenated.slice(1.0, 2.0)
+    assert np.array_equal(window.times, [1.5, 2.0, 2.0])
+    assert np.array_equal(window.amounts, [3.0, 3.0, 100.0])
+    assert len(concatenated.slice(t_end=0.25)) == 0
+
+def test_discount_cashflow():
+    cashflow = CashFlow(times=[0.5, 1.0, 1.5, 2.0, 2.0], amounts=[3.0, 3.0, 3.0, 3.0, 100.0])
+    rate = InterestRate(0.05, 'continuous')
+    assert np.isclose(rate.discount_cashflow(cashflow), sum(rate.discount(t, a) for t, a in cashflow), atol=1e-12)
+
+    curve = ZeroRateCurve([ZeroRate(0.5, 0.050, 'continuous'), ZeroRate(1.0, 0.058, 'continuous'),
+                           ZeroRate(1.5, 0.064, 'continuous'), ZeroRate(2.0, 0.068, 'continuous')])
+    expected = sum(a*np.exp(-curve.curve(t)*t) for t, a in cashflow)
+    assert np.isclose(curve.discount_cashflow(cashflow), expected, atol=1e-12)
@@ -0,0 +1,61 @@
+import sys
+sys.path.append('..')
+import numpy as np
+import pytest
+from src.python.interest_rate import InterestRate, ZeroRate, ZeroRateCurve
+from src.python.bond import Bond
+
+zero_rates_table_42 = [ZeroRate(0.5, 0.050, 'continuous'),
+                       ZeroRate(1.0, 0.058, 'continuous'),
+                       ZeroRate(1.5, 0.064, 'continuous'),
+                       ZeroRate(2.0, 0.068, 'continuous')]
+
+def test_curve_cache_hits_and_misses():
+    curve = ZeroRateCurve(zero_rates_table_42)
+    assert curve.cache_stats() is None
+
+    curve.enable_cache(maxsize=2)
+    bonds = [Bond(principal=100.0, interest_rate=InterestRate(c, 1), coupon_frequency=2, time_to_maturity=2.0) for c in (0.03, 0.06, 0.09)]
+    prices = [bond.get_bond_price_from_zero_rates(zero_rates=curve) for bond in bonds]
+
+    # same semi-annual grid, only the coupon differs
+    stats = curve.cache_stats()
+    assert (stats['misses'], stats['hits'], stats['size']) == (1, 2, 1)
+    assert np.isclose(prices[1], 98.39, atol=1e-2)
+
+    curve.disable_cache()
+    assert np.allclose(prices, [bond.get_bond_price_from_zero_rates(zero_rates=curve) for bond in bonds], atol=1e-14)
+
+def test_curve_cache_lru_eviction():
+    curve = ZeroRateCurve(zero_rates_table_42)
+    curve.enable_cache(maxsize=2)
+
+    grid_a, grid_b, grid_c = np.array([0.5, 1.0]), np.array([0.25, 0.75]), np.array([1.5, 2.0])
+    curve.discount_factors(grid_a)
+    curve.discount_factors(grid_b)
+    curve.discount_factors(grid_a)  # a is now the most recently used
+    curve.discount_factors(grid_c)  # evicts b
+    curve.discount_factors(grid_a)
+
+    stats = curve.cache_stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (2, 3, 1, 2)
+    assert np.isclose(stats['hit_rate'], 0.4)
+
+    with pytest.raises(ValueError):
+        curve.discount_factors(grid_a)[0] = 1.0
+
+def test_curve_cache_invalidated_by_new_rates():
+    curve = ZeroRateCurve(zero_rates_table_42)
+    curve.enable_cache()
+    times = np.array([0.5, 1.0, 1.5, 2.0])
+    before = curve.discount_factors(times)
+
+    curve.update_rates([ZeroRate(r.time, r.rate + 0.01, 'continuous') for r in zero_rates_table_42])
+    after = curve.discount_factors(times)
+
+    assert np.allclose(after, before*np.exp(-0.01*times), atol=1e-15)
+    assert curve.cache_stats()['invalidations'] == 1
+    assert curve.cache_stats()['misses'] == 2
+
+    with pytest.raises(AssertionError):
+        curve.update_rates([ZeroRate(r.time + 0.1, r.rate, 'continuous') for r in zero_rates_table_42])
@@ -0,0 +1,80 @@
+import sys
+sys.path.append('..')
+import numpy as np
+import pytest
+from scipy.interpolate import interp1d
+from src.python.curve_interpolation import LinearZeroRateInterpolator, LogLinearDiscountInterpolator, MonotoneConvexInterpolator, INTERPOLATORS
+from src.python.interest_rate import ZeroRate, ZeroRateCurve, ForwardRate
+
+times = np.array([0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0])
+rates = np.array([0.030, 0.032, 0.031, 0.035, 0.040, 0.041, 0.039])
+t = np.linspace(0.0, 12.0, 481)
+
+def test_linear_matches_interp1d():
+    reference = interp1d(x=times, y=rates, kind="linear", bounds_error=False, fill_value=(rates[0], rates[-1]))
+    interpolator = LinearZeroRateInterpolator(times, rates)
+
+    assert np.allclose(interpolator.zero_rates(t), reference(t), atol=1e-15)
+    assert np.allclose(interpolator.discount_factors(t), np.exp(-reference(t)*t), atol=1e-15)
+    assert np.isclose(interpolator.zero_rates(1.5), reference(1.5), atol=1e-15)
+    assert np.ndim(interpolator.zero_rates(1.5)) == 0
+
+@pytest.mark.parametrize("interpolation", list(INTERPOLATORS))
+def test_interpolators_are_consistent(interpolation):
+    interpolator = INTERPOLATORS[interpolation](times, rates)
+
+    # the knots are reproduced
+    assert np.allclose(interpolator.zero_rates(times), rates, atol=1e-15)
+    # -log(discount factor) is the integral of the instantaneous forwards
+    fine = np.linspace(0.0, 12.0, 200001)
+    forwards = interpolator.instantaneous_forwards(fine)
+    integral = np.concatenate([[0.0], np.cumsum(0.5*(forwards[1:] + forwards[:-1])*np.diff(fine))])
+    assert np.allclose(integral[::5000], -np.log(interpolator.discount_factors(fine[::5000])), atol=1e-8)
+    # flat zero rate after the last knot
+    assert np.allclose(interpolator.zero_rates([10.0, 11.0, 20.0]), rates[-1], atol=1e-15)
+
+def test_log_linear_discount_forwards_are_piecewise_flat():
+    interpolator = LogLinearDiscountInterpolator(times, rates)
+    discrete_forwards = np.diff(np.concatenate([[0.0], rates*times]))/np.diff(np.concatenate([[0.0], times]))
+
+    midpoints = 0.5*(np.concatenate([[0.0], times[:-1]]) + times)
+    assert np.allclose(interpolator.instantaneous_forwards(midpoints), discrete_forwards, atol=1e-15)
+
+def test_monotone_convex_forwards():
+    interpolator = MonotoneConvexInterpolator(times, rates)
+
+    # continuous at the knots
+    eps = 1e-9
+    assert np.allclose(interpolator.instantaneous_forwards(times[:-1] - eps), interpolator.instantaneous_forwards(times[:-1] + eps), atol=1e-7)
+
+    # monotone discrete forwards give monotone instantaneous forwards
+    increasing = MonotoneConvexInterpolator(times, 0.02 + 0.01*np.log1p(times))
+    assert np.all(np.diff(increasing.instantaneous_forwards(np.linspace(0.0, 10.0, 1001))) >= -1e-15)
+
+def test_monotone_convex_flat_forward_segment():
+    # equal neighbouring discrete forwards put g0 or g1 of an interval at exactly 0
+    for knot_times, knot_rates in (([1.0, 2.0, 3.0, 4.0, 5.0], [0.03, 0.03, 0.03, 0.035, 0.04]),
+                                   ([1.0, 2.0, 3.0, 4.0], [0.02, 0.03, 0.03, 0.03])):
+        knot_times, knot_rates = np.array(knot_times), np.array(knot_rates)
+        interpolator = MonotoneConvexInterpolator(knot_times, knot_rates)
+        s = np.linspace(0.0, knot_times[-1] + 1.0, 601)
+        assert np.all(np.isfinite(interpolator.discount_factors(s)))
+        assert np.all(np.isfinite(interpolator.instantaneous_forwards(s)))
+        assert np.allclose(interpolator.zero_rates(knot_times), knot_rates, atol=1e-15)
+
+    # flat discrete forward of 3% between 1 and 3
+    interpolator = MonotoneConvexInterpolator(np.array([1.0, 2.0, 3.0, 4.0, 5.0]), np.array([0.03, 0.03, 0.03, 0.035, 0.04]))
+    assert np.allclose(interpolator.discount_factors([1.5, 2.0, 2.5]), np.exp(-0.03*np.array([1.5, 2.0, 2.5])), atol=1e-15)
+
+def test_zero_rate_curve_interpolation():
+    zero_rates = [ZeroRate(t_i, r_i, 'continuous') for t_i, r_i in zip(times, rates)]
+    for interpolation in INTERPOLATORS:
+        curve = ZeroRateCurve(zero_rates, interpolation=interpolation)
+        assert curve.interpolation == interpolation
+        assert np.allclose(curve.zero_rates(times), rates, atol=1e-15)
+
+        forward = ForwardRate.calculate_forward_rate_from_zero_rates(curve, 1.0, 2.0)
+        assert np.isclose(forward(), (0.031*2.0 - 0.032*1.0)/1.0, atol=1e-12)
+
+    with pytest.raises(AssertionError):
+        ZeroRateCurve(zero_rates, interpolation='cubic')
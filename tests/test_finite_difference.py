@@ -0,0 +1,70 @@
+import sys
+sys.path.append('..')
+import numpy as np
+from src.python.interest_rate import InterestRate
+from src.python.analytic_solutions.vanilla_call import BlackScholesVanillaCall
+from src.python.numerical_solutions.finite_difference import CrankNicolsonVanillaOption, solve_tridiagonal, factor_tridiagonal, solve_factored_tridiagonal
+
+def test_solve_tridiagonal_batch():
+    rng = np.random.default_rng(0)
+    n, m = 30, 4
+    lower, upper = rng.uniform(-1.0, 1.0, (2, n))
+    diagonal = rng.uniform(3.0, 4.0, (n, m))
+    rhs = rng.standard_normal((n, m))
+
+    x = solve_tridiagonal(lower[:, None], diagonal, upper[:, None], rhs)
+    for k in range(m):
+        A = np.diag(diagonal[:, k]) + np.diag(lower[1:], -1) + np.diag(upper[:-1], 1)
+        assert np.allclose(x[:, k], np.linalg.solve(A, rhs[:, k]), atol=1e-12)
+
+def test_factored_tridiagonal_reused():
+    rng = np.random.default_rng(1)
+    n = 30
+    lower, upper = rng.uniform(-1.0, 1.0, (2, n))
+    diagonal = rng.uniform(3.0, 4.0, n)
+    A = np.diag(diagonal) + np.diag(lower[1:], -1) + np.diag(upper[:-1], 1)
+
+    # one matrix, factored once, for a vector and for several columns
+    factors = factor_tridiagonal(lower, diagonal, upper)
+    rhs = rng.standard_normal((n, 3))
+    assert np.allclose(solve_factored_tridiagonal(factors, rhs), np.linalg.solve(A, rhs), atol=1e-12)
+    assert np.allclose(solve_factored_tridiagonal(factors, rhs[:, 0]), np.linalg.solve(A, rhs[:, 0]), atol=1e-12)
+
+    # a matrix per column and the same right hand side for every column
+    x = solve_tridiagonal(lower[:, None], diagonal[:, None] + [0.0, 1e8], upper[:, None], rhs[:, 0])
+    assert x.shape == (n, 2)
+    assert np.allclose(x[:, 0], np.linalg.solve(A, rhs[:, 0]), atol=1e-12)
+
+def test_crank_nicolson_european_call_against_analytic():
+    r = InterestRate(0.05, 'continuous')
+    q = InterestRate(0.02, 'continuous')
+    K = np.array([80., 90., 100., 110., 120.])
+    analytic = BlackScholesVanillaCall.price_and_greeks(S=100., K=K, T=1., sigma=0.2, r=r, q=q)
+
+    numerical = CrankNicolsonVanillaOption(S=100., K=K, T=1., sigma=0.2, r=r, q=q, american=False).solve()
+
+    assert np.allclose(numerical['price'], analytic['price'], atol=2e-2)
+    assert np.allclose(numerical['delta'], analytic['delta'], atol=1e-3)
+    assert np.allclose(numerical['gamma'], analytic['gamma'], atol=1e-4)
+
+def test_crank_nicolson_american_options():
+    # Hull, American put S=50, K=50, r=10%, sigma=40%, 5 months
+    american_put = CrankNicolsonVanillaOption(S=50., K=50., T=5./12., sigma=0.4, r=InterestRate(0.1, 'continuous'), q=InterestRate(0.0, 'continuous'),
+                                              option_type='put').solve()
+    assert np.isclose(american_put['price'][0], 4.28, atol=1e-2)
+
+    r = InterestRate(0.05, 'continuous')
+    q = InterestRate(0.03, 'continuous')
+    K = np.linspace(80., 130., 6)
+    option_data = dict(S=100., K=K, T=1., sigma=0.25, r=r, q=q, option_type='put')
+    american = CrankNicolsonVanillaOption(**option_data).solve()
+    european = CrankNicolsonVanillaOption(american=False, **option_data).solve()
+    assert np.all(american['price'] > european['price'])
+    assert np.all(american['price'] >= np.maximum(K - 100., 0.0))
+    assert np.all(american['delta'] <= 0.0) and np.all(american['gamma'] >= 0.0)
+
+    # without dividends an American call is never exercised early
+    no_dividends = dict(S=100., K=K, T=1., sigma=0.25, r=r, q=InterestRate(0.0, 'continuous'))
+    american_call = CrankNicolsonVanillaOption(**no_dividends).solve()
+    european_call = CrankNicolsonVanillaOption(american=False, **no_dividends).solve()
+    assert np.allclose(american_call['price'], european_call['price'], atol=1e-6)
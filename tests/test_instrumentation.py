@@ -0,0 +1,56 @@
+import sys
+sys.path.append('..')
+from src.python import instrumentation
+from src.python.interest_rate import InterestRate, ZeroRate, ZeroRateCurve
+from src.python.bond import Bond
+from src.python.analytic_solutions.vanilla_call import BlackScholesVanillaCall
+
+zero_rates_table_42 = [ZeroRate(0.5, 0.050, 'continuous'),
+                       ZeroRate(1.0, 0.058, 'continuous'),
+                       ZeroRate(1.5, 0.064, 'continuous'),
+                       ZeroRate(2.0, 0.068, 'continuous')]
+
+def test_instrumentation_disabled_records_nothing():
+    instrumentation.reset()
+    instrumentation.disable()
+    bond = Bond(principal=100.0, interest_rate=InterestRate(0.08, 1), coupon_frequency=2, time_to_maturity=3.0)
+    bond.calculate_bond_yield(bond_price=104.0)
+
+    assert not instrumentation.is_enabled()
+    assert instrumentation.snapshot() == dict(timers={}, counters={})
+
+def test_instrumentation_records_calls_iterations_and_builds():
+    bond = Bond(principal=100.0, interest_rate=InterestRate(0.08, 1), coupon_frequency=2, time_to_maturity=3.0)
+
+    with instrumentation.recording():
+        bond.calculate_bond_yield(bond_price=104.0)
+        bond.calculate_bond_yield(bond_price=101.0)
+
+        curve = ZeroRateCurve(zero_rates_table_42)
+        curve.enable_cache()
+        bond.get_bond_price_from_zero_rates(zero_rates=curve)
+        bond.get_bond_price_from_zero_rates(zero_rates=curve)
+        bond.get_bond_price_from_zero_rates(zero_rates=zero_rates_table_42)
+
+        BlackScholesVanillaCall.option_price(S=100., K=100., T=1., sigma=0.2, r=InterestRate(0.05, 'continuous'), q=InterestRate(0.0, 'continuous'))
+
+    assert not instrumentation.is_enabled()
+    stats = instrumentation.snapshot()
+    timers, counters = stats['timers'], stats['counters']
+
+    assert timers['Bond.calculate_bond_yield']['calls'] == 2
+    assert timers['Bond.calculate_bond_yield']['seconds'] > 0.0
+    assert counters['Bond.calculate_bond_yield.iterations'] >= 2
+    assert counters['Bond.calculate_bond_yield.function_calls'] >= counters['Bond.calculate_bond_yield.iterations']
+
+    assert timers['Bond.get_bond_price_from_zero_rates']['calls'] == 3
+    assert counters['InterestRateCurve.builds'] == 2
+    assert timers['InterestRateCurve.update_rates']['calls'] == 2
+    assert (counters['DiscountFactorCache.misses'], counters['DiscountFactorCache.hits']) == (1, 1)
+
+    assert timers['BlackScholesVanillaCall.option_price']['calls'] == 1
+    assert timers['BlackScholesVanillaCall.d_plus']['calls'] == 2
+
+    # snapshots are copies
+    stats['counters']['InterestRateCurve.builds'] = 0
+    assert instrumentation.snapshot()['counters']['InterestRateCurve.builds'] == 2
@@ -1,7 +1,10 @@
 import sys
 sys.path.append('..')
+import pickle
 import numpy as np
-from src.python.interest_rate import InterestRate, ZeroRate, ForwardRate
+import pytest
+from src.python.cashflow import CashFlow
+from src.python.interest_rate import InterestRate, ZeroRate, ForwardRate, ZeroRateCurve
 
 def test_interest_rates_change_interest_frequency():
     rate_page_103 = InterestRate(0.06, 2)
@@ -71,4 +74,100 @@ def test_calculate_forward_rate_from_zero_rates():
         t2 = zero_rates_pq_4_13[i].time
         forward_rate = ForwardRate.calculate_forward_rate_from_zero_rates(zero_rates_pq_4_13, t1, t2)
         logger.info(f'Forward rate from t={t1} to t={t2}: {forward_rate():g}')
-        np.isclose(forward_rate(), results_pq_4_13[i-1], atol=1e-4)
\ No newline at end of file
+        np.isclose(forward_rate(), results_pq_4_13[i-1], atol=1e-4)
+
+def test_interest_rate_is_immutable():
+    rate = InterestRate(0.05, 2)
+    with pytest.raises(AttributeError):
+        rate.rate = 0.06
+    with pytest.raises(AttributeError):
+        del rate.rate
+    with pytest.raises(AttributeError):
+        rate.extra = 1
+
+    source = np.array([0.01, 0.02])
+    rates = InterestRate(source, 'continuous')
+    with pytest.raises(ValueError):
+        rates.rate[0] = 0.5
+
+    # the rate owns its values, editing the source array changes neither the rate nor its conversions
+    semi_annual = rates(2).copy()
+    source[0] = 0.5
+    assert np.array_equal(rates.rate, [0.01, 0.02])
+    assert np.array_equal(rates(2), semi_annual)
+    assert not np.shares_memory(rates.rate, source)
+
+def test_interest_rate_caches_conversions():
+    rate = InterestRate(0.05, 'continuous')
+    assert rate(2) is rate(2)
+    assert rate() is rate.rate
+    assert np.isclose(rate(2), InterestRate.change_interest_frequency(r1=0.05, m1='continuous', m2=2))
+
+def test_interest_rate_arrays():
+    rates = np.array([0.01, 0.03, 0.05])
+    array_rate = InterestRate(rates, 4)
+    for i, r in enumerate(rates):
+        scalar_rate = InterestRate(r, 4)
+        assert np.isclose(array_rate()[i], scalar_rate())
+        assert np.isclose(array_rate(12)[i], scalar_rate(12))
+
+    cashflow = CashFlow(times=[0.5, 1.0, 1.5], amounts=[2.0, 2.0, 102.0])
+    pvs = array_rate.discount_cashflow(cashflow)
+    assert pvs.shape == (3,)
+    assert np.allclose(pvs, [InterestRate(r, 4).discount_cashflow(cashflow) for r in rates])
+
+def test_array_zero_rate_curve():
+    times = np.array([0.5, 1.0, 2.0, 5.0])
+    rates = np.array([0.02, 0.025, 0.03, 0.035])
+    columnar = ZeroRateCurve(ZeroRate(times, rates, 'continuous'))
+    per_knot = ZeroRateCurve([ZeroRate(t, r, 'continuous') for t, r in zip(times, rates)])
+
+    t = np.linspace(0.0, 6.0, 25)
+    assert np.allclose(columnar.discount_factors(t), per_knot.discount_factors(t))
+
+    columnar.update_rates(ZeroRate(times, rates + 0.01, 'continuous'))
+    assert np.allclose(columnar.zero_rates(times), rates + 0.01)
+
+    # the curve copied its inputs, editing them afterwards does not change it
+    source_times, source_rates = times.copy(), rates.copy()
+    curve = ZeroRateCurve(ZeroRate(source_times, source_rates, 'continuous'))
+    discount_factors = curve.discount_factors(t)
+    source_times[0], source_rates[:] = 0.25, 0.5
+    assert np.array_equal(curve.times, times) and np.array_equal(curve.continuous_rates, rates)
+    assert np.array_equal(curve.discount_factors(t), discount_factors)
+
+def test_interest_rates_pickle():
+    rate = ZeroRate(np.array([1.0, 2.0]), np.array([0.03, 0.04]), 2)
+    rate(4)
+    restored = pickle.loads(pickle.dumps(rate))
+    assert np.array_equal(restored.time, rate.time)
+    assert np.array_equal(restored(4), rate(4))
+    with pytest.raises(AttributeError):
+        restored.time = 0.0
+
+def test_zero_rate_curve_from_arrays():
+    times = np.array([0.5, 1.0, 2.0, 5.0])
+    rates = np.array([0.02, 0.025, 0.03, 0.035])
+    curve = ZeroRateCurve.from_arrays(times, rates)
+    per_knot = ZeroRateCurve([ZeroRate(t, r, 'continuous') for t, r in zip(times, rates)])
+
+    t = np.linspace(0.0, 6.0, 25)
+    assert np.allclose(curve.discount_factors(t), per_knot.discount_factors(t))
+
+    # continuous float64 columns are not copied
+    assert np.shares_memory(curve.times, times)
+    assert np.shares_memory(curve.interpolator.rates, rates)
+    assert rates.flags.writeable
+
+    semi_annual = ZeroRateCurve.from_arrays(times, rates, compounding_frequency=2, interpolation='log_linear_discount')
+    assert np.allclose(semi_annual.zero_rates(times), [ZeroRate(t, r, 2).rate for t, r in zip(times, rates)])
+
+def test_zero_rate_curve_from_arrays_validation():
+    with pytest.raises(AssertionError):
+        ZeroRateCurve.from_arrays([1.0, 2.0], [0.01, 0.02, 0.03])
+    with pytest.raises(AssertionError):
+        ZeroRateCurve.from_arrays([1.0, 0.5], [0.01, 0.02])
+    with pytest.raises(AssertionError):
+        ZeroRateCurve.from_arrays([1.0, 2.0], [0.01, np.nan])
+    with pytest.raises(AssertionError):
+        ZeroRateCurve.from_arrays(np.ones((2, 2)), np.ones((2, 2)))
@@ -0,0 +1,47 @@
+import sys
+sys.path.append('..')
+import numpy as np
+from src.python.interest_rate import InterestRate
+from src.python.analytic_solutions.vanilla_call import BlackScholesVanillaCall
+from src.python.numerical_solutions.monte_carlo import GBMMonteCarlo, VanillaCallPayoff, VanillaPutPayoff
+
+option_data_web = dict(S=100., T=1., sigma=0.2, r=InterestRate(0.05, "continuous"), q=InterestRate(0.02, 'continuous'))
+
+def test_monte_carlo_vanilla_call_against_analytic():
+    engine = GBMMonteCarlo(**option_data_web)
+    analytic = BlackScholesVanillaCall.option_price(K=105., **option_data_web)
+
+    plain = engine.price(VanillaCallPayoff(105.), n_paths=200_000, antithetic=False, seed=1, processes=1)
+    antithetic = engine.price(VanillaCallPayoff(105.), n_paths=200_000, antithetic=True, seed=1, processes=1)
+    control = engine.price(VanillaCallPayoff(105.), n_paths=200_000, antithetic=True, control_variate_strike=100., seed=1, processes=1)
+
+    for result in (plain, antithetic, control):
+        assert result.n_paths == 200_000
+        assert abs(result.price - analytic) < 4.0*result.standard_error
+    assert antithetic.standard_error < plain.standard_error
+    assert control.standard_error < 0.25*antithetic.standard_error
+
+    # the same option as control is exact
+    exact = engine.price(VanillaCallPayoff(105.), n_paths=10_000, control_variate_strike=105., seed=1, processes=1)
+    assert np.isclose(exact.price, analytic, atol=1e-10)
+
+def test_monte_carlo_put_call_parity_and_steps():
+    engine = GBMMonteCarlo(n_steps=12, **option_data_web)
+    put = engine.price(VanillaPutPayoff(100.), n_paths=100_000, control_variate_strike=100., seed=7, processes=1)
+
+    call = BlackScholesVanillaCall.option_price(K=100., **option_data_web)
+    parity_put = call - 100.*np.exp(-0.02) + 100.*np.exp(-0.05)
+    assert abs(put.price - parity_put) < 4.0*put.standard_error
+
+def test_monte_carlo_streaming_and_reproducibility():
+    engine = GBMMonteCarlo(**option_data_web)
+    kwargs = dict(n_paths=50_000, chunk_size=8_192, control_variate_strike=100., seed=3)
+
+    running = list(engine.iter_price(VanillaCallPayoff(110.), processes=1, **kwargs))
+    assert [result.n_paths for result in running] == [8_192*i for i in range(1, 7)] + [50_000]
+    assert running[-1].standard_error < running[0].standard_error
+
+    # chunks have their own streams, spreading them over processes gives the same numbers
+    parallel = engine.price(VanillaCallPayoff(110.), processes=2, **kwargs)
+    assert parallel.price == running[-1].price
+    assert parallel.standard_error == running[-1].standard_error
@@ -0,0 +1,87 @@
+import sys
+sys.path.append('..')
+import asyncio
+import numpy as np
+from src.python.interest_rate import InterestRate, ZeroRateCurve
+from src.python.bond import Bond
+from src.python.analytic_solutions.vanilla_call import BlackScholesVanillaCall
+from src.python.pricing_service import PricingService, Histogram, BATCH_SIZE_BOUNDS
+
+curve = ZeroRateCurve.from_arrays([0.5, 1.0, 1.5, 2.0], [0.050, 0.058, 0.064, 0.068])
+r = InterestRate(0.05, 'continuous')
+q = InterestRate(0.01, 'continuous')
+
+def make_bonds(n):
+    return [Bond(principal=100.0, interest_rate=InterestRate(0.01*(i % 7), 1), coupon_frequency=2, time_to_maturity=0.5*(1 + i % 4))
+            for i in range(n)]
+
+def test_pricing_service_batches_concurrent_requests():
+    bond_requests = [make_bonds(3) for _ in range(20)]
+    strikes = [np.linspace(80.0, 120.0, 5) + i for i in range(20)]
+
+    async def main():
+        async with PricingService(window=5e-3) as service:
+            bonds = [service.price_bonds(bonds, zero_rates=curve) for bonds in bond_requests]
+            calls = [service.price_calls(S=100.0, K=K, T=1.0, sigma=0.2, r=r, q=q) for K in strikes]
+            results = await asyncio.gather(*bonds, *calls)
+            return results, service.metrics()
+
+    results, metrics = asyncio.run(main())
+    for bonds, prices in zip(bond_requests, results[:20]):
+        assert np.allclose(prices, [bond.get_bond_price_from_zero_rates(zero_rates=curve) for bond in bonds], rtol=1e-12)
+    for K, greeks in zip(strikes, results[20:]):
+        expected = BlackScholesVanillaCall.price_and_greeks(S=100.0, K=K, T=1.0, sigma=0.2, r=r, q=q)
+        assert greeks['price'].shape == K.shape
+        assert np.allclose(greeks['price'], expected['price']) and np.allclose(greeks['delta'], expected['delta'])
+
+    # everything was sent at once so it is priced in a single batch per instrument type
+    assert metrics['batch_size']['bond']['count'] == 1 and metrics['batch_size']['bond']['max'] == 60
+    assert metrics['batch_size']['call']['count'] == 1 and metrics['batch_size']['call']['max'] == 100
+    assert metrics['latency']['bond']['count'] == 20 and metrics['latency']['call']['count'] == 20
+
+def test_pricing_service_isolates_bad_requests():
+    async def main():
+        async with PricingService(window=1e-3) as service:
+            return await asyncio.gather(service.price_calls(S=100.0, K=100.0, T=1.0, sigma=0.2, r=r, q=q),
+                                        service.price_calls(S=100.0, K=-1.0, T=1.0, sigma=0.2, r=r, q=q),
+                                        return_exceptions=True)
+
+    good, bad = asyncio.run(main())
+    assert np.isclose(good['price'], BlackScholesVanillaCall.price_and_greeks(S=100.0, K=100.0, T=1.0, sigma=0.2, r=r, q=q)['price'])
+    assert isinstance(bad, AssertionError)
+
+def test_pricing_service_backpressure():
+    async def main():
+        service = await PricingService(window=1e-3, max_batch_size=4, max_queue_size=2).start()
+        results = await asyncio.gather(*(service.price_bonds(make_bonds(2), zero_rates=curve) for _ in range(10)))
+        metrics = service.metrics()
+        await service.stop()
+        return results, metrics
+
+    results, metrics = asyncio.run(main())
+    assert len(results) == 10 and all(prices.shape == (2,) for prices in results)
+    assert metrics['backpressure_waits'] > 0
+    assert metrics['batch_size']['bond']['max'] <= 4
+
+def test_pricing_service_caps_batch_size():
+    sizes = [3, 3, 2, 1, 3, 5]
+
+    async def main():
+        async with PricingService(window=5e-3, max_batch_size=4) as service:
+            results = await asyncio.gather(*(service.price_bonds(make_bonds(n), zero_rates=curve) for n in sizes))
+            return results, service.metrics()
+
+    results, metrics = asyncio.run(main())
+    assert [prices.size for prices in results] == sizes
+    # 3 | 3 | 2+1 | 3 | 5, a request larger than the cap is priced alone
+    assert metrics['batch_size']['bond']['count'] == 5
+    assert metrics['batch_size']['bond']['counts'][np.searchsorted(BATCH_SIZE_BOUNDS, 5)] == 1
+    assert metrics['requests_per_batch']['max'] == 2
+
+def test_histogram():
+    histogram = Histogram([1.0, 2.0, 4.0])
+    for value in [0.5, 1.5, 1.5, 3.0, 10.0]:
+        histogram.observe(value)
+    assert histogram.counts.tolist() == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == 2.0
+    assert histogram.quantile(1.0) == 10.0
@@ -0,0 +1,65 @@
+import sys
+sys.path.append('..')
+import numpy as np
+import pytest
+from src.python.interest_rate import InterestRate, ZeroRate, ZeroRateCurve
+from src.python.bond import Bond
+from src.python.bond_portfolio import BondPortfolio
+from src.python.risk import key_rate_dv01
+
+zero_rates = [ZeroRate(1.0, 0.020, 'continuous'),
+              ZeroRate(2.0, 0.030, 'continuous'),
+              ZeroRate(3.0, 0.037, 'continuous'),
+              ZeroRate(4.0, 0.042, 'continuous'),
+              ZeroRate(5.0, 0.045, 'continuous')]
+
+bonds = [Bond(principal=100.0, interest_rate=InterestRate(0.05, 1), coupon_frequency=2, time_to_maturity=5.0),
+         Bond(principal=100.0, interest_rate=InterestRate(0.03, 1), coupon_frequency=4, time_to_maturity=2.75),
+         Bond(principal=100.0, interest_rate=InterestRate(0.0, 1), coupon_frequency=0, time_to_maturity=0.5),
+         Bond(principal=100.0, interest_rate=InterestRate(0.07, 1), coupon_frequency=1, time_to_maturity=7.0)]
+
+def bumped_curve_dv01(interpolation, bump=1e-4):
+    """ The by hand way: a bumped ZeroRateCurve per knot and a price per bond. """
+    base = ZeroRateCurve(zero_rates, interpolation=interpolation)
+    dv01 = np.empty((len(bonds), len(zero_rates)))
+    for k in range(len(zero_rates)):
+        bumped = ZeroRateCurve([ZeroRate(r.time, r.rate + bump*(i == k), 'continuous') for i, r in enumerate(zero_rates)], interpolation=interpolation)
+        for j, bond in enumerate(bonds):
+            dv01[j, k] = bond.get_bond_price_from_zero_rates(zero_rates=base) - bond.get_bond_price_from_zero_rates(zero_rates=bumped)
+    return dv01
+
+@pytest.mark.parametrize("interpolation", ['linear', 'log_linear_discount', 'monotone_convex'])
+def test_key_rate_dv01_matches_bumped_curves(interpolation):
+    curve = ZeroRateCurve(zero_rates, interpolation=interpolation)
+    dv01 = key_rate_dv01(curve, bonds)
+
+    assert dv01.shape == (len(bonds), len(zero_rates))
+    assert np.allclose(dv01, bumped_curve_dv01(interpolation), atol=1e-11)
+
+def test_key_rate_dv01_properties():
+    curve = ZeroRateCurve(zero_rates)
+    portfolio = BondPortfolio(bonds)
+    dv01 = key_rate_dv01(curve, portfolio)
+
+    # the 6 month zero coupon bond only depends on the first knot (flat extrapolation)
+    assert dv01[2, 0] > 0.0 and np.all(dv01[2, 1:] == 0.0)
+    # the 2.75y bond does not depend on the knots after 3y
+    assert np.all(dv01[1, 3:] == 0.0)
+
+    # the sum of key rate DV01s is the DV01 of a parallel shift, to first order
+    analytic = key_rate_dv01(curve, portfolio, method='analytic')
+    assert np.allclose(analytic, dv01, rtol=1e-3)
+    shifted = ZeroRateCurve([ZeroRate(r.time, r.rate + 1e-4, 'continuous') for r in zero_rates])
+    parallel = portfolio.get_bond_prices_from_zero_rates(zero_rates=curve) - portfolio.get_bond_prices_from_zero_rates(zero_rates=shifted)
+    assert np.allclose(dv01.sum(axis=1), parallel, rtol=1e-3)
+
+def test_key_rate_dv01_analytic_needs_linear_scheme():
+    curve = ZeroRateCurve(zero_rates, interpolation='monotone_convex')
+    assert not curve.interpolator.rate_times_linear_in_rates
+    with pytest.raises(AssertionError):
+        key_rate_dv01(curve, bonds, method='analytic')
+
+def test_key_rate_dv01_monotone_convex_flat_forwards():
+    flat = [ZeroRate(t, r, 'continuous') for t, r in zip([1.0, 2.0, 3.0, 4.0], [0.02, 0.03, 0.03, 0.03])]
+    dv01 = key_rate_dv01(ZeroRateCurve(flat, interpolation='monotone_convex'), bonds)
+    assert np.all(np.isfinite(dv01))
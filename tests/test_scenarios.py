@@ -0,0 +1,78 @@
+import sys
+sys.path.append('..')
+import numpy as np
+import pytest
+from src.python.interest_rate import InterestRate, ZeroRateCurve
+from src.python.bond import Bond
+from src.python.bond_portfolio import BondPortfolio
+from src.python.scenarios import ScenarioEngine, ParallelShift, Twist, HistoricalReplay
+
+times = np.array([0.5, 1.0, 2.0, 3.0, 5.0])
+rates = np.array([0.050, 0.058, 0.064, 0.068, 0.07])
+
+def make_bonds():
+    return [
+        Bond(principal=100.0, interest_rate=InterestRate(0.06, 1), coupon_frequency=2, time_to_maturity=2.0),
+        Bond(principal=100.0, interest_rate=InterestRate(0.04, 1), coupon_frequency=2, time_to_maturity=1.5),
+        Bond(principal=50.0, interest_rate=InterestRate(0.08, 1), coupon_frequency=4, time_to_maturity=6.0),
+        Bond(principal=100.0, interest_rate=InterestRate(0.0, 1), coupon_frequency=0, time_to_maturity=1.25),
+    ]
+
+def loop_prices(bonds, scenario_rates, interpolation):
+    return np.array([[bond.get_bond_price_from_zero_rates(zero_rates=ZeroRateCurve.from_arrays(times, scenario, interpolation=interpolation))
+                      for bond in bonds] for scenario in scenario_rates])
+
+@pytest.mark.parametrize('interpolation', ['linear', 'log_linear_discount', 'monotone_convex'])
+def test_scenario_engine_matches_repricing(interpolation):
+    bonds = make_bonds()
+    curve = ZeroRateCurve.from_arrays(times, rates, interpolation=interpolation)
+    engine = ScenarioEngine(zero_rates=curve, portfolio=bonds, scenarios=Twist(np.linspace(-0.002, 0.002, 7), pivot=2.0))
+
+    assert engine.shape == (7, 4)
+    assert np.allclose(engine.run(processes=1), loop_prices(bonds, engine.scenario_rates, interpolation), rtol=1e-12)
+
+def test_scenario_generators():
+    assert np.allclose(ParallelShift([0.0, 0.01])(rates, times), [rates, rates + 0.01])
+    assert np.allclose(Twist([0.01], pivot=1.0)(rates, times)[0], rates + 0.01*(times - 1.0))
+
+    history = rates + np.cumsum(np.full((4, times.size), 1e-3), axis=0)
+    replay = HistoricalReplay.from_history(history)
+    assert np.allclose(replay(rates, times), rates + 1e-3)
+
+def test_scenario_engine_streams_blocks_across_processes():
+    bonds = make_bonds()
+    curve = ZeroRateCurve.from_arrays(times, rates)
+    engine = ScenarioEngine(zero_rates=curve, portfolio=bonds, scenarios=ParallelShift(np.linspace(-0.01, 0.01, 10)), block_size=3)
+    expected = engine.run(processes=1)
+
+    seen = np.zeros(len(engine), dtype=bool)
+    for start, stop, pvs in engine.iter_blocks(processes=2):
+        assert pvs.shape == (stop - start, len(bonds))
+        assert np.allclose(pvs, expected[start:stop], rtol=1e-14)
+        seen[start:stop] = True
+    assert seen.all()
+
+def test_scenario_engine_large_portfolio_path(tmp_path):
+    # no dense cash matrix for this one: flows are summed per bond
+    bonds = make_bonds()*2
+    portfolio = BondPortfolio(bonds)
+    curve = ZeroRateCurve.from_arrays(times, rates)
+    engine = ScenarioEngine(zero_rates=curve, portfolio=portfolio, scenarios=ParallelShift([0.0, 0.01]), max_cash_matrix_size=0)
+    assert 'cash_matrix' not in engine.arrays
+
+    out = np.lib.format.open_memmap(tmp_path/'pvs.npy', mode='w+', shape=engine.shape)
+    engine.run(processes=1, out=out)
+    assert np.allclose(out, loop_prices(bonds, engine.scenario_rates, 'linear'), rtol=1e-12)
+
+def test_scenario_engine_stops_early():
+    curve = ZeroRateCurve.from_arrays(times, rates)
+    engine = ScenarioEngine(zero_rates=curve, portfolio=make_bonds(), scenarios=ParallelShift(np.linspace(-0.01, 0.01, 40)), block_size=1)
+    expected = engine.run(processes=1)
+
+    blocks = engine.iter_blocks(processes=2)
+    start, stop, pvs = next(blocks)
+    assert np.allclose(pvs, expected[start:stop], rtol=1e-14)
+    blocks.close()
+
+    # the engine is reusable after an early stop
+    assert np.allclose(engine.run(processes=2), expected, rtol=1e-14)
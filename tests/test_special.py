@@ -0,0 +1,33 @@
+import sys
+sys.path.append('..')
+import os
+import subprocess
+import numpy as np
+from scipy.special import ndtr
+from src.python.special import norm_cdf, norm_ppf, norm_pdf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_norm_cdf_matches_scipy():
+    x = np.linspace(-37.0, 9.0, 10_001)
+    assert np.array_equal(norm_cdf(x), ndtr(x))
+    assert norm_cdf(x.reshape(-1, 1)).shape == (x.size, 1)
+    # single values go through math.erfc, rounding x/sqrt(2) costs ~x**2 ulps deep in the left tail
+    for value in (-30.0, -3.0, -0.5, 0.0, 0.2, 2.0, 8.0):
+        assert np.isclose(norm_cdf(value), ndtr(value), rtol=1e-12, atol=0.0)
+    assert norm_cdf(-np.inf) == 0.0 and norm_cdf(np.inf) == 1.0 and np.isnan(norm_cdf(np.nan))
+    assert np.isclose(norm_pdf(0.0), 1.0/np.sqrt(2.0*np.pi))
+
+def test_norm_ppf():
+    assert np.isclose(norm_ppf(0.975), 1.959963984540054)
+    p = np.linspace(0.01, 0.99, 101)
+    assert np.allclose(norm_cdf(norm_ppf(p)), p, rtol=1e-14)
+
+    values = norm_ppf(np.array([0.0, 1.0, -0.5, 1.5, np.nan]))
+    assert values[0] == -np.inf and values[1] == np.inf and np.isnan(values[2:]).all()
+
+def test_pricing_modules_do_not_import_scipy():
+    modules = ['src.python.bond', 'src.python.bond_portfolio', 'src.python.analytic_solutions.vanilla_call',
+               'src.python.numerical_solutions.monte_carlo', 'src.python.scenarios', 'src.python.storage']
+    code = f"import sys\nimport {', '.join(modules)}\nassert 'scipy' not in sys.modules, sorted(m for m in sys.modules if m.startswith('scipy'))"
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
@@ -0,0 +1,86 @@
+import sys
+sys.path.append('..')
+import numpy as np
+import pytest
+from src.python.interest_rate import InterestRate, ZeroRateCurve
+from src.python.cashflow import CashFlow
+from src.python.bond import Bond
+from src.python.bond_portfolio import BondPortfolio
+from src.python.storage import MarketDataStore
+
+def make_bonds():
+    return [
+        Bond(principal=100.0, interest_rate=InterestRate(0.06, 1), coupon_frequency=2, time_to_maturity=2.0),
+        Bond(principal=100.0, interest_rate=InterestRate(0.04, 1), coupon_frequency=2, time_to_maturity=1.5),
+        Bond(principal=50.0, interest_rate=InterestRate(0.08, 1), coupon_frequency=4, time_to_maturity=3.0),
+        Bond(principal=100.0, interest_rate=InterestRate(0.0, 1), coupon_frequency=0, time_to_maturity=1.25),
+    ]
+
+def make_curve(shift=0.0, interpolation='linear'):
+    return ZeroRateCurve.from_arrays([0.5, 1.0, 1.5, 2.0, 3.0], np.array([0.050, 0.058, 0.064, 0.068, 0.07]) + shift,
+                                     interpolation=interpolation)
+
+def test_store_round_trip(tmp_path):
+    store = MarketDataStore(tmp_path/'market.pbf')
+    curve = make_curve(interpolation='monotone_convex')
+    cashflows = [CashFlow(times=[0.5, 1.0], amounts=[3.0, 103.0]), CashFlow(times=[2.0], amounts=[100.0])]
+    bonds = make_bonds()
+    store.append_curve('USD', curve)
+    store.append_cashflows('schedules', cashflows)
+    store.append_bonds('book', bonds)
+
+    reopened = MarketDataStore(tmp_path/'market.pbf')
+    assert reopened.names() == ['USD', 'schedules', 'book']
+
+    loaded_curve = reopened.load_curve('USD')
+    assert loaded_curve.interpolation == 'monotone_convex'
+    t = np.linspace(0.0, 4.0, 41)
+    assert np.array_equal(loaded_curve.discount_factors(t), curve.discount_factors(t))
+
+    for loaded, cashflow in zip(reopened.load_cashflows('schedules'), cashflows):
+        assert np.array_equal(loaded.times, cashflow.times) and np.array_equal(loaded.amounts, cashflow.amounts)
+
+    portfolio = reopened.load_portfolio('book')
+    expected = [bond.get_bond_price_from_zero_rates(zero_rates=curve) for bond in bonds]
+    assert np.allclose(portfolio.get_bond_prices_from_zero_rates(zero_rates=loaded_curve), expected, rtol=1e-12)
+    assert np.allclose(portfolio.calculate_bond_yields(bond_prices=expected).root,
+                       BondPortfolio(bonds).calculate_bond_yields(bond_prices=expected).root)
+
+    for loaded, bond in zip(reopened.load_bonds('book'), bonds):
+        assert np.allclose(loaded.cashflow.amounts, bond.cashflow.amounts, rtol=1e-14)
+        assert np.array_equal(loaded.cashflow.times, bond.cashflow.times)
+
+def test_store_is_memory_mapped_and_read_only(tmp_path):
+    store = MarketDataStore(tmp_path/'market.pbf')
+    store.append_bonds('book', make_bonds())
+    portfolio = store.load_portfolio('book')
+
+    assert isinstance(portfolio.times.base, np.memmap)
+    assert portfolio.times.ctypes.data % 64 == 0
+    with pytest.raises(ValueError):
+        portfolio.amounts[0] = 0.0
+
+def test_store_append_snapshots(tmp_path):
+    path = tmp_path/'market.pbf'
+    store = MarketDataStore(path)
+    store.append_curve('USD', make_curve())
+    first_snapshot = path.read_bytes()
+
+    reader = MarketDataStore(path)
+    store.append_curve('USD', make_curve(shift=0.01))
+
+    # the first snapshot is left as is and readers see the new one after a refresh
+    assert path.read_bytes()[:len(first_snapshot)] == first_snapshot
+    assert np.isclose(reader.load_curve('USD').zero_rates(1.0), 0.058)
+    assert np.isclose(reader.refresh().load_curve('USD').zero_rates(1.0), 0.068)
+    assert [record.name for record in reader.records] == ['USD', 'USD']
+
+def test_store_rejects_other_files(tmp_path):
+    path = tmp_path/'not_a_store.bin'
+    path.write_bytes(b'\1'*128)
+    with pytest.raises(AssertionError):
+        MarketDataStore(path)
+
+    store = MarketDataStore(tmp_path/'market.pbf')
+    with pytest.raises(KeyError):
+        store.load_curve('EUR')